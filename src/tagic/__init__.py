@@ -0,0 +1,5 @@
+from .cache import cached_component
+from .diffing import diff
+from .parser import parse
+
+__all__ = ["cached_component", "diff", "parse"]
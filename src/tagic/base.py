@@ -1,21 +1,122 @@
-from dataclasses import dataclass, field, fields
+from __future__ import annotations
+
+import codecs
+import hashlib
+import os
+import re
+from collections.abc import AsyncIterator, Awaitable
+from contextvars import ContextVar
+from copy import copy, deepcopy
+from dataclasses import MISSING, Field, dataclass, field, replace
+from functools import lru_cache
 from html import escape
-from typing import Any, ClassVar, Protocol, Self, Sequence
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Protocol,
+    Self,
+    Sequence,
+    cast,
+    dataclass_transform,
+    get_origin,
+    overload,
+)
+from uuid import uuid4
+
+if TYPE_CHECKING:
+    # imported on use, they are slow to import
+    import asyncio
+    from concurrent.futures import Executor
+
+    from .query import TreeIndex
 
 
 def _not_none(v: Any) -> bool:
     return v is not None
 
 
+def _escape_text(text: str) -> str:
+    if "&" in text or "<" in text or ">" in text or '"' in text or "'" in text:
+        return escape(text)
+    return text
+
+
+def _escape_attr(value: str) -> str:
+    if "&" in value or '"' in value or "<" in value or ">" in value:
+        return (
+            value.replace("&", "&amp;")
+            .replace('"', "&quot;")
+            .replace("<", "&lt;")
+            .replace(">", "&gt;")
+        )
+    return value
+
+
+# Strings up to this length are memoized, e.g. labels and class names.
+_MEMO_MAX_LEN = 64
+_escape_text_memo = lru_cache(maxsize=4096)(_escape_text)
+_escape_attr_memo = lru_cache(maxsize=4096)(_escape_attr)
+
+
+def escape_text(text: str) -> str:
+    """Escape text content, same as `html.escape`.
+
+    Text without special characters is returned as is, short strings
+    are memoized.
+    """
+    if len(text) <= _MEMO_MAX_LEN:
+        return _escape_text_memo(text)
+    return _escape_text(text)
+
+
+def escape_attr(value: str) -> str:
+    """Escape a value for a double quoted attribute.
+
+    Values without special characters are returned as is, short strings
+    are memoized.
+    """
+    if len(value) <= _MEMO_MAX_LEN:
+        return _escape_attr_memo(value)
+    return _escape_attr(value)
+
+
+def _render_text(text: str, indent: str | None) -> str:
+    if indent is None:
+        return escape_text(text)
+    return f"{indent}{escape_text(text)}\n"
+
+
 class CanRender(Protocol):
     def do_render(self, indent: str | None) -> str:  # pragma: no cover
         ...
 
 
-Element = str | None | CanRender
+class SupportsWrite(Protocol):
+    def write(self, s: str, /) -> object:  # pragma: no cover
+        ...
+
+
+class SupportsWriteBytes(Protocol):
+    def write(self, b: bytes, /) -> object:  # pragma: no cover
+        ...
+
+
+Element = str | None | CanRender | Awaitable["Element | Elements"]
 Elements = Sequence[Element]
 
 
+def _render_other(child: CanRender | Awaitable[Any], indent: str | None) -> str:
+    if isinstance(child, Awaitable):
+        raise TypeError("Awaitable children need arender() or aiter_render().")
+    return child.do_render(indent)
+
+
 class DOMConfig:
     # Specify the indent on rendering for every level.
     INDENT = 2
@@ -24,30 +125,516 @@ class DOMConfig:
     FULL_XHTML = False
 
 
+_HTML_DOCTYPE = "<!DOCTYPE html>\n"
+_XHTML_DOCTYPE = (
+    '<?xml version="1.0" encoding="{encoding}" ?>\n'
+    '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.1//EN" '
+    '"http://www.w3.org/TR/xhtml11/DTD/xhtml11.dtd">\n'
+)
+# number of indent prefixes computed up front
+_INDENT_LEVELS = 32
+
+
+@dataclass(frozen=True, slots=True)
+class RenderOptions:
+    """Options for rendering, replacing the global `DOMConfig`.
+
+    Immutable, hence one instance can be used from many threads at
+    once, e.g. `node.render(options=RenderOptions(indent=4))`.
+    """
+
+    # Spaces per level, None renders without indent and newlines.
+    indent: int | None = None
+    # Render the document xhtml1 complient, see `DOMConfig.FULL_XHTML`.
+    full_xhtml: bool = False
+    # The encoding declared in xml prologs, set by `render_bytes` and co.
+    encoding: str = "UTF-8"
+    # Render html as small as possible: collapse whitespace, leave out
+    # optional end tags and quotes. Cannot be used with indent or xhtml.
+    minify: bool = False
+
+    doctype: str = field(init=False, repr=False, compare=False)
+    _indents: tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.minify and (self.indent is not None or self.full_xhtml):
+            raise ValueError("minify cannot be used with indent or full_xhtml.")
+        doctype = _HTML_DOCTYPE
+        if self.full_xhtml:
+            doctype = _XHTML_DOCTYPE.format(encoding=self.encoding)
+        object.__setattr__(self, "doctype", doctype)
+        indents = ()
+        if self.indent is not None:
+            indents = tuple(" " * (self.indent * d) for d in range(_INDENT_LEVELS))
+        object.__setattr__(self, "_indents", indents)
+
+    @staticmethod
+    def from_config(indent: bool = False) -> "RenderOptions":
+        """Options from the current `DOMConfig`."""
+        return _config_options(
+            DOMConfig.INDENT if indent else None, DOMConfig.FULL_XHTML
+        )
+
+    def indent_at(self, depth: int) -> str | None:
+        """The indent prefix of a level or None without indent."""
+        if self.indent is None:
+            return None
+        if depth < _INDENT_LEVELS:
+            return self._indents[depth]
+        return " " * (self.indent * depth)
+
+    def depth_of(self, indent: str | None) -> int:
+        """The level of an indent prefix."""
+        if not indent or not self.indent:
+            return 0
+        return len(indent) // self.indent
+
+    def bool_attr(self, name: str) -> str:
+        """A set boolean attribute."""
+        if self.full_xhtml:
+            return f' {name}="{name}"'
+        return f" {name}"
+
+
+@lru_cache
+def _config_options(indent: int | None, full_xhtml: bool) -> RenderOptions:
+    return RenderOptions(indent=indent, full_xhtml=full_xhtml)
+
+
+def _options(indent: bool, options: RenderOptions | None) -> RenderOptions:
+    if options is None:
+        return RenderOptions.from_config(indent)
+    return options
+
+
+# the options of the running render, for nodes overriding `do_render`
+_ACTIVE_OPTIONS: ContextVar[RenderOptions | None] = ContextVar(
+    "_ACTIVE_OPTIONS", default=None
+)
+
+
+def _render_itself(node: Node, options: RenderOptions, depth: int) -> str:
+    """Render a node overriding `do_render` with `options`."""
+    token = _ACTIVE_OPTIONS.set(options)
+    try:
+        return node.do_render(options.indent_at(depth))
+    finally:
+        _ACTIVE_OPTIONS.reset(token)
+
+
+def _iter_tree(root: Node, options: RenderOptions, depth: int) -> Iterator[str]:
+    """The walk of `Node._iter_parts`."""
+    # the levels above the current one: (children, depth, end tag)
+    stack: list[tuple[Iterator[Element], int, str]] = []
+    children: Iterator[Element] = iter((root,))
+    end_tag = ""
+    indent = options.indent_at(depth)
+
+    while True:
+        for child in children:
+            if isinstance(child, str):
+                yield _render_text(child, indent)
+            elif isinstance(child, Node):
+                if child is not root and type(child)._RENDERS_ITSELF:
+                    yield from child._iter_parts(options, depth)
+                    continue
+
+                prologue = child._prologue(options)
+                if prologue:
+                    yield prologue
+
+                content = child._content()
+                if not content:
+                    yield child._start_tag(options, indent, empty=True)
+                    continue
+
+                yield child._start_tag(options, indent, empty=False)
+                # descend into the children of `child`
+                stack.append((children, depth, end_tag))
+                children = iter(content)
+                end_tag = child._end_tag(indent)
+                depth += 1
+                indent = options.indent_at(depth)
+                break
+            elif child is not None:
+                yield _render_other(child, indent)
+        else:
+            # all children done, continue with the parent level
+            if not stack:
+                return
+            yield end_tag
+            children, depth, end_tag = stack.pop()
+            indent = options.indent_at(depth)
+
+
+# ascii whitespace, others like nbsp are kept
+_WHITESPACE = re.compile("[ \t\n\r\f]+")
+
+
+def _iter_minified(
+    root: Node,
+    options: RenderOptions,
+    parent: Node | None = None,
+    keep_space: bool = False,
+    next_sibling: Element = None,
+) -> Iterator[str]:
+    """Like `Node._iter_parts`, for `RenderOptions.minify`.
+
+    Looks at the next sibling and the parent of a node for its end tag,
+    hence walks the content by position. `parent`, `keep_space` and
+    `next_sibling` are the place of the root in a tree.
+    """
+    # the levels above the current one: (content, position, parent,
+    # keep whitespace)
+    stack: list[tuple[Elements, int, Node | None, bool]] = []
+    content: Elements = (root,)
+    pos = 0
+
+    while True:
+        if pos < len(content):
+            child = content[pos]
+            pos += 1
+            if isinstance(child, str):
+                text = escape_text(child)
+                yield text if keep_space else _WHITESPACE.sub(" ", text)
+            elif isinstance(child, Node):
+                if child is not root and type(child)._RENDERS_ITSELF:
+                    yield from child._iter_minified_parts(
+                        options, keep_space, _sibling(content, pos), parent
+                    )
+                    continue
+
+                yield child._prologue(options)
+                child_content = child._content()
+                if not child_content:
+                    yield child._start_tag(options, None, empty=True)
+                    continue
+
+                yield child._start_tag(options, None, empty=False)
+                stack.append((content, pos, parent, keep_space))
+                content, pos, parent = child_content, 0, child
+                keep_space = keep_space or child._keeps_whitespace()
+            elif child is not None:
+                yield _render_other(child, None)
+        else:
+            # all children done, continue with the parent level
+            if not stack:
+                return
+            node = cast(Node, parent)
+            content, pos, parent, keep_space = stack.pop()
+            # the root has the given next sibling
+            following = _sibling(content, pos, None if stack else next_sibling)
+            if not node._omit_end_tag(following, parent):
+                yield node._end_tag(None)
+
+
+def _sibling(content: Elements, pos: int, default: Element = None) -> Element:
+    return content[pos] if pos < len(content) else default
+
+
+def _chunks(parts: Iterable[str], chunk_size: int) -> Iterator[str]:
+    """Join `parts` into chunks of at least `chunk_size` characters."""
+    chunk: list[str] = []
+    size = 0
+    for part in parts:
+        chunk.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield "".join(chunk)
+            chunk = []
+            size = 0
+    if chunk:
+        yield "".join(chunk)
+
+
+# kinds of entries in an `AttrPlan`
+_ATTR_VALUE = 0  # a single field, e.g. `id`
+_ATTR_DICT = 1  # a dict of attributes with a prefix, e.g. `data_attr`
+AttrPlan = tuple[tuple[str, str, int], ...]
+_ATTR_PLANS: dict[type, AttrPlan] = {}
+# the plan by field name: (position, attribute name / prefix, kind)
+# and the entries with defaults, that are rendered, with their defaults
+AttrEntry = tuple[int, str, int]
+AttrIndex = tuple[dict[str, AttrEntry], tuple[tuple[str, AttrEntry, Any], ...]]
+_ATTR_INDEXES: dict[type, AttrIndex] = {}
+# attribute name -> field name per class
+_ATTR_FIELDS: dict[type, dict[str, str]] = {}
+
+
+def _attr_fields(cls: type[Node]) -> dict[str, str]:
+    """The fields of single attributes by attribute name, see `_attr_plan`."""
+    attr_fields = _ATTR_FIELDS.get(cls)
+    if attr_fields is None:
+        attr_fields = _ATTR_FIELDS[cls] = {
+            name: field_name
+            for field_name, name, kind in cls._attr_plan()
+            if kind == _ATTR_VALUE
+        }
+    return attr_fields
+
+
+def _dict_field(cls: type[Node], name: str) -> tuple[str, str]:
+    """The field for an attribute without own field, e.g. `data_attr`."""
+    for dict_field, prefix in cls._ATTR_DICTS:
+        if prefix and name.startswith(prefix):
+            return dict_field, prefix
+    return "attr", ""
+
+
+def _write_file(
+    path: Path, chunks: Iterable[bytes], buffer_size: int, atomic: bool
+) -> None:
+    """Write `chunks` to `path`, with `atomic` via a temporary file."""
+    target = path
+    if atomic:
+        target = path.with_name(f".{path.name}.{os.getpid()}.{uuid4().hex}.tmp")
+
+    try:
+        with open(target, "xb" if atomic else "wb", buffering=buffer_size) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        if atomic:
+            os.replace(target, path)
+    except BaseException:
+        if atomic:
+            target.unlink(missing_ok=True)
+        raise
+
+
+class NodeField(NamedTuple):
+    """A field of a node class, like `dataclasses.Field`."""
+
+    name: str
+    default: Any = MISSING
+    default_factory: Any = MISSING
+    init: bool = True
+    compare: bool = True
+
+
+class _Lazy:
+    """Class level default of a field with a default factory.
+
+    The value is only created on the first access of an instance, so
+    nodes do not carry e.g. empty dicts for attributes never used.
+    """
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self.factory = factory
+        self.name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, node: Any, owner: type | None = None) -> Any:
+        if node is None:
+            return self
+        value = node.__dict__[self.name] = self.factory()
+        return value
+
+
+class _Stamp:
+    """Whether a cache of a tree is still valid, shared by its nodes.
+
+    `Node._changed` invalidates the stamps of the node and with them the
+    dependent stamps, e.g. of fingerprints reusing the cached one.
+    """
+
+    __slots__ = ("dependents", "valid")
+
+    def __init__(self) -> None:
+        self.valid = True
+        self.dependents: list[_Stamp] = []
+
+    def invalidate(self) -> None:
+        stamps = [self]
+        while stamps:
+            stamp = stamps.pop()
+            if stamp.valid:
+                stamp.valid = False
+                stamps.extend(stamp.dependents)
+                stamp.dependents = []
+
+    def add_dependent(self, stamp: _Stamp) -> None:
+        self.dependents = [dep for dep in self.dependents if dep.valid]
+        self.dependents.append(stamp)
+
+
+def _mark(node: Node, stamp: _Stamp) -> None:
+    """Let `Node._changed` of `node` invalidate `stamp`."""
+    node._stamps = (*(old for old in node._stamps if old.valid), stamp)
+
+
+@dataclass_transform(kw_only_default=True, field_specifiers=(field,))
 class _Meta(type):
-    """Allow []-access on the class of Nodes."""
+    """Collect the fields of nodes and allow []-access on the class.
+
+    The annotated class attributes are the fields, like for a kw_only
+    dataclass. But no code is generated: they are not stored on the
+    instances until they are set, defaults stay on the class and
+    default factories are only called on the first access (see
+    `Node.__init__`).
+    """
+
+    _FIELDS: dict[str, NodeField]
+    _INIT_NAMES: frozenset[str]
+    # init fields without default, like in dataclasses
+    _REQUIRED: frozenset[str]
+    # whether the class overrides `_iter_parts` or `do_render`, e.g.
+    # `Frozen`, the walks of a tree let these nodes render themselves
+    _RENDERS_ITSELF: bool
+
+    def __new__(
+        mcls, name: str, bases: tuple[type, ...], namespace: dict[str, Any]
+    ) -> "_Meta":
+        if "__slots__" in namespace:
+            raise TypeError(
+                f"{name}: nodes store only the set fields in their __dict__ "
+                "and cannot have __slots__."
+            )
+        own = {}
+        for field_name, annotation in namespace.get("__annotations__", {}).items():
+            if _is_classvar(annotation):
+                continue
+            default = namespace.get(field_name, MISSING)
+            if isinstance(default, Field):
+                node_field = NodeField(
+                    field_name,
+                    default.default,
+                    default.default_factory,
+                    default.init,
+                    default.compare,
+                )
+                if node_field.default_factory is not MISSING:
+                    namespace[field_name] = _Lazy(node_field.default_factory)
+                elif node_field.default is MISSING:
+                    del namespace[field_name]
+                else:
+                    namespace[field_name] = node_field.default
+            else:
+                node_field = NodeField(field_name, default)
+            own[field_name] = node_field
+
+        cls = super().__new__(mcls, name, bases, namespace)
+        node_fields: dict[str, NodeField] = {}
+        for base in reversed(cls.__mro__[1:]):
+            node_fields.update(getattr(base, "_FIELDS", {}))
+        # redeclared fields keep their position, like in dataclasses
+        node_fields.update(own)
+        cls._FIELDS = node_fields
+        cls._INIT_NAMES = frozenset(
+            field_.name for field_ in node_fields.values() if field_.init
+        )
+        cls._REQUIRED = frozenset(
+            field_.name
+            for field_ in node_fields.values()
+            if field_.init
+            and field_.default is MISSING
+            and field_.default_factory is MISSING
+        )
+        # the classes in front of `Node` (the last node class), with mixins
+        node_classes = [base for base in cls.__mro__ if isinstance(base, _Meta)]
+        subclasses = cls.__mro__[: cls.__mro__.index(node_classes[-1])]
+        cls._RENDERS_ITSELF = any(
+            "_iter_parts" in vars(base) or "do_render" in vars(base)
+            for base in subclasses
+        )
+        return cls
+
+    def __setattr__(cls, name: str, value: Any) -> None:
+        if name == "__dataclass_fields__":
+            # e.g. the lazy defaults would be shared defaults for dataclasses
+            raise TypeError(
+                f"{cls.__name__}: nodes are not dataclasses, declare the fields "
+                "as annotated class attributes without @dataclass."
+            )
+        super().__setattr__(name, value)
 
     def __getitem__(self, child: Element | Elements) -> "Node":
         return self()[child]  # type: ignore
 
 
-@dataclass(kw_only=True, slots=True)
+def _is_classvar(annotation: Any) -> bool:
+    if isinstance(annotation, str):
+        return annotation.startswith(("ClassVar", "typing.ClassVar"))
+    return annotation is ClassVar or get_origin(annotation) is ClassVar
+
+
 class Node(metaclass=_Meta):
     NAME: ClassVar[str | None] = None
+    # fields holding dicts of further attributes and the prefix to
+    # put infront of their keys on rendering
+    _ATTR_DICTS: ClassVar[tuple[tuple[str, str], ...]] = (("attr", ""),)
     attr: dict[str, str | bool] = field(default_factory=dict)
     children: Elements = field(default_factory=list)
+    # digest of the subtree and its stamp, see `fingerprint`
+    _fingerprint: tuple[bytes, _Stamp] | None = field(
+        default=None, init=False, compare=False
+    )
+    # see `find_all`: the index of the subtree and the stamps of the
+    # indexes and fingerprints, that contain this node
+    _index: TreeIndex | None = field(default=None, init=False, compare=False)
+    _stamps: tuple[_Stamp, ...] = field(default=(), init=False, compare=False)
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Only store the given fields, the others stay at the default.
+
+        Fields without default are required, like in dataclasses.
+        """
+        cls = type(self)
+        if kwargs:
+            if unknown := kwargs.keys() - cls._INIT_NAMES:
+                raise TypeError(
+                    f"{cls.__name__}() got unexpected keyword arguments: "
+                    f"{', '.join(sorted(unknown))}"
+                )
+            self.__dict__.update(kwargs)
+        if cls._REQUIRED and (missing := cls._REQUIRED - kwargs.keys()):
+            raise TypeError(
+                f"{cls.__name__}() missing required keyword arguments: "
+                f"{', '.join(sorted(missing))}"
+            )
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return _compared_fields(self) == _compared_fields(other)
+
+    # mutable, like dataclasses with eq
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # only send the fields, that are set, e.g. to other processes,
+        # and the subtree as a flat list: pickle and deepcopy would
+        # recurse for every level
+        return (_restore_tree, (_flatten(self),))
+
+    def __copy__(self) -> Self:
+        return cast(Self, _restore(type(self), _state(self)))
 
     def __getitem__(self, child: Element | Elements) -> Self:
         """Add children to the node via []-syntax."""
         if child is None:
             pass
-        elif isinstance(child, Sequence) and not isinstance(child, str):
+        elif isinstance(child, (str, Node)):
+            # the common case, checked before the slower Sequence
+            self.children = [child]
+        elif isinstance(child, Sequence):
             self.children = list(filter(_not_none, child))
         else:
             self.children = [child]
 
+        self._changed()
         return self
 
+    def _changed(self) -> None:
+        """Reset the cached fingerprints and indexes after changing the node.
+
+        Also those of the ancestors, they share the stamps of the node.
+        """
+        self.__dict__.pop("_fingerprint", None)
+        for stamp in self.__dict__.pop("_stamps", ()):
+            stamp.invalidate()
+
     @property
     def tag_name(self) -> str:
         return self.NAME or self.__class__.__name__
@@ -58,95 +645,437 @@ class Node(metaclass=_Meta):
     def __repr__(self) -> str:
         return self.render()
 
-    def render(self, indent: bool = False) -> str:
-        if indent:
-            return self.do_render("")
+    def render(
+        self,
+        indent: bool = False,
+        options: RenderOptions | None = None,
+        workers: int | Executor | None = None,
+    ) -> str:
+        """Render the node.
+
+        Without `options`, they are taken from `DOMConfig`; `indent`
+        is only used in that case.
+
+        With `workers` (a number of processes or an executor), the
+        children of the first node with at least as many children as
+        there are workers (looking into the biggest child on the way
+        down) are rendered in parallel. The output is the same.
+        """
+        options = _options(indent, options)
+        if workers is None:
+            return "".join(self._iter_parts(options, 0))
+        if isinstance(workers, int):
+            from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+            with ProcessPoolExecutor(workers) as executor:
+                return _render_parallel(self, options, executor, workers)
+        return _render_parallel(self, options, workers, _PARALLEL_MIN_CHILDREN)
+
+    def render_bytes(
+        self,
+        indent: bool = False,
+        encoding: str = "utf-8",
+        options: RenderOptions | None = None,
+    ) -> bytes:
+        """Render the node encoded with `encoding`.
+
+        The output is encoded chunk by chunk while rendering, characters
+        not available in `encoding` are written as character references.
+        """
+        return b"".join(self._iter_encoded(_options(indent, options), encoding))
+
+    @overload
+    def render_to(
+        self,
+        sink: SupportsWrite,
+        indent: bool = False,
+        options: RenderOptions | None = None,
+        encoding: None = None,
+    ) -> None: ...
+
+    @overload
+    def render_to(
+        self,
+        sink: SupportsWriteBytes | bytearray,
+        indent: bool = False,
+        options: RenderOptions | None = None,
+        *,
+        encoding: str,
+    ) -> None: ...
+
+    def render_to(
+        self,
+        sink: SupportsWrite | SupportsWriteBytes | bytearray,
+        indent: bool = False,
+        options: RenderOptions | None = None,
+        encoding: str | None = None,
+    ) -> None:
+        """Render the node into `sink`, e.g. an open file or `io.StringIO`.
+
+        The output is written piece by piece, the full document is never
+        held in memory. With `encoding`, the output is encoded (see
+        `render_bytes`) and written to a binary `sink`, e.g. a file opened
+        in binary mode or a `bytearray`.
+        """
+        options = _options(indent, options)
+        if encoding is None:
+            write_str = cast(SupportsWrite, sink).write
+            for part in self._iter_parts(options, 0):
+                write_str(part)
+            return
+
+        if isinstance(sink, bytearray):
+            write_bytes: Callable[[bytes], object] = sink.extend
         else:
-            return self.do_render(None)
+            write_bytes = cast(SupportsWriteBytes, sink).write
+        for chunk in self._iter_encoded(options, encoding):
+            write_bytes(chunk)
+
+    def render_to_file(
+        self,
+        path: str | os.PathLike[str],
+        indent: bool = False,
+        options: RenderOptions | None = None,
+        *,
+        buffer_size: int = 64 * 1024,
+        atomic: bool = True,
+    ) -> None:
+        """Render the node into the file at `path`.
+
+        The output is encoded with the encoding of the options while
+        rendering (see `render_bytes`) and streamed to disk through a
+        buffer of `buffer_size` bytes, the document is never held in
+        memory. With `atomic`, the output is
+        written to a temporary file next to `path`, that replaces `path`
+        only after rendering succeeded.
+        """
+        options = _options(indent, options)
+        _write_file(
+            Path(path),
+            self._iter_encoded(options, options.encoding, buffer_size),
+            buffer_size,
+            atomic,
+        )
 
     def do_render(self, indent: str | None) -> str:
-        indent_str = ""
-        new_indent = None
-        if indent is not None:
-            new_indent = indent + (" " * DOMConfig.INDENT)
-            indent_str = indent
-        result = f"{indent_str}<{self.tag_name}"
-        # filter None children
-        self.children = list(filter(_not_none, self.children))
-        no_content = len(self.children) == 0
-
-        def indent_newline() -> None:
-            nonlocal result
-            if indent is not None:
-                result += "\n"
-
-        result += self._render_attr()
-
-        if no_content:
-            result += " />"
-        else:
-            result += ">"
-        indent_newline()
+        """Render the node at the level of the prefix `indent`.
+
+        Overrides are called with the options of the running render and
+        can call this to render the node as usual. Outside of a render,
+        the options are taken from `DOMConfig`.
+        """
+        options = _ACTIVE_OPTIONS.get()
+        if options is None:
+            options = RenderOptions.from_config(indent is not None)
+        depth = options.depth_of(indent)
+        if type(self)._iter_parts is not Node._iter_parts:
+            return "".join(self._iter_parts(options, depth))
+        # not `_iter_parts`, that would call the override again
+        if options.minify:
+            return "".join(_iter_minified(self, options))
+        return "".join(_iter_tree(self, options, depth))
+
+    def fingerprint(self) -> str:
+        """A stable hash of the subtree, e.g. for ETags or cache keys.
+
+        Computed from the tag names, the set attributes and the children
+        without rendering. The result is cached per node and reset by
+        `[]` (and `add_class` / `remove_class` of html elements) of the
+        node or a descendant. Setting fields or changing lists of children
+        directly is not noticed, build the tree first or `freeze` it.
+        """
+        return self._digest().hex()
+
+    def _digest(self) -> bytes:
+        cached = self._fingerprint
+        if cached is None or not cached[1].valid:
+            _fingerprint_tree(self)
+            cached = cast(tuple[bytes, _Stamp], self._fingerprint)
+        return cached[0]
+
+    def find_by_id(self, node_id: str) -> Node | None:
+        """The first node below this node with the attribute `id`."""
+        return self._query_index().find_by_id(node_id)
+
+    def find_all(self, tag: str | None = None, class_: str | None = None) -> list[Node]:
+        """The nodes below this node with the tag name and class, if given.
+
+        Nodes are returned in document order, the contents of frozen
+        nodes are not searched. Like all queries, this uses an index of
+        the subtree, built on the first query and reused until a node of
+        the subtree is changed by `[]` (or `add_class` / `remove_class`
+        of html elements). Setting fields or changing lists of children
+        directly is not noticed, build the tree first.
+        """
+        return self._query_index().find_all(tag, class_)
+
+    def select(self, selector: str) -> list[Node]:
+        """The nodes below this node matching the css `selector`.
+
+        Supports type, `*`, `#id`, `.class`, `[attr]` and `[attr=value]`
+        selectors, the descendant (` `) and child (`>`) combinators and
+        groups (`,`), e.g. `nav > ul a[href]`. This node can match the
+        ancestors in the selector. Raises ValueError for other selectors.
+        """
+        return self._query_index().select(selector)
+
+    def _query_index(self) -> TreeIndex:
+        index = self._index
+        if index is None or not index.valid:
+            from .query import TreeIndex  # noqa: PLC0415
+
+            index = self._index = TreeIndex(self)
+        return index
+
+    def freeze(self) -> "Frozen":
+        """Get an immutable copy of this node, that caches its output.
+
+        The copy renders like this node and can be used as a child
+        everywhere. The subtree is only rendered once per indent level
+        and config, later renders emit the cached text.
+        """
+        return Frozen(deepcopy(self))
+
+    def iter_render(
+        self,
+        indent: bool = False,
+        chunk_size: int = 8192,
+        options: RenderOptions | None = None,
+    ) -> Iterator[str]:
+        """Render the node lazily and yield the output in document order.
+
+        Parts are collected until at least `chunk_size` characters are
+        available, e.g. to be send as chunks of a streaming http response.
+        """
+        return _chunks(self._iter_parts(_options(indent, options), 0), chunk_size)
+
+    def _iter_encoded(
+        self, options: RenderOptions, encoding: str, chunk_size: int = 8192
+    ) -> Iterator[bytes]:
+        encoder = codecs.getincrementalencoder(encoding)("xmlcharrefreplace")
+        options = replace(options, encoding=encoding.upper())
+        for chunk in _chunks(self._iter_parts(options, 0), chunk_size):
+            yield encoder.encode(chunk)
+        final = encoder.encode("", final=True)
+        if final:
+            yield final
+
+    async def arender(
+        self, indent: bool = False, options: RenderOptions | None = None
+    ) -> str:
+        """Render a node with awaitable children.
+
+        All awaitables in the tree are awaited concurrently, see
+        `aiter_render`.
+        """
+        return "".join([chunk async for chunk in self.aiter_render(indent, 0, options)])
+
+    async def aiter_render(
+        self,
+        indent: bool = False,
+        chunk_size: int = 8192,
+        options: RenderOptions | None = None,
+    ) -> AsyncIterator[str]:
+        """Render a node with awaitable children lazily.
+
+        Awaitables (e.g. coroutines) can be used as children, they can
+        return anything, that can be a child. All awaitables of the tree
+        are started right away and run concurrently, while the output is
+        yield in document order, like `iter_render`. An awaitable is only
+        awaited, once the output reaches it. Minified output is not
+        supported and raises ValueError.
+        """
+        options = _options(indent, options)
+        if options.minify:
+            raise ValueError("Minified output is not supported for awaitables.")
+        tasks: dict[int, asyncio.Future[Any]] = {}
+        pending: set[int] = set()
+        _schedule(self, tasks, pending)
+        chunk: list[str] = []
+        size = 0
+        try:
+            async for part in _aiter_parts(self, options, 0, tasks, pending):
+                chunk.append(part)
+                size += len(part)
+                if size >= chunk_size:
+                    yield "".join(chunk)
+                    chunk = []
+                    size = 0
+            if chunk:
+                yield "".join(chunk)
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+    def _iter_parts(self, options: RenderOptions, depth: int) -> Iterator[str]:
+        """Generate the rendered parts of the node in document order.
+
+        The tree is walked with an explicit stack instead of recursion,
+        hence there is no limit on the depth of the tree. Nodes, that
+        override `_iter_parts` (e.g. `Frozen`) or `do_render`, render
+        themselves.
+        """
+        if type(self).do_render is not Node.do_render:
+            return iter((_render_itself(self, options, depth),))
+        if options.minify:
+            return _iter_minified(self, options)
+        return _iter_tree(self, options, depth)
+
+    def _iter_minified_parts(
+        self,
+        options: RenderOptions,
+        keep_space: bool,
+        next_sibling: Element,
+        parent: Node | None,
+    ) -> Iterator[str]:
+        """The minified parts of the node at its place in a tree.
+
+        `keep_space` is whether whitespace in text is kept, e.g. inside a
+        `pre`. Nodes, that override `_iter_parts`, should override this
+        as well, by default they render without their place.
+        """
+        if not type(self)._RENDERS_ITSELF:
+            return _iter_minified(self, options, parent, keep_space, next_sibling)
+        return self._iter_parts(options, 0)
+
+    def _prologue(self, options: RenderOptions) -> str:
+        """Text in front of the node, e.g. a doctype."""
+        return ""
+
+    def _keeps_whitespace(self) -> bool:
+        """Whether whitespace in the text of the subtree is kept on minify."""
+        return True
 
-        result += self._render_content(new_indent)
+    def _omit_end_tag(self, next_sibling: Element, parent: Node | None) -> bool:
+        """Whether the end tag can be left out on minify.
 
-        if not no_content:
-            result += f"{indent_str}</{self.tag_name}>"
-            indent_newline()
+        `next_sibling` is None for the last child, `parent` is None for
+        the rendered node itself.
+        """
+        return False
 
-        return result
+    def _content(self) -> Elements:
+        """The children to render.
 
-    def _render_content(self, indent: str | None) -> str:
-        result = ""
+        Must not change the node, rendering only reads the tree.
+        """
+        children = _children(self)
+        if None in children:
+            # filter None children
+            return list(filter(_not_none, children))
+        return children
 
-        for child in self.children:
-            if child is None:
+    def _start_tag(
+        self, options: RenderOptions, indent: str | None, empty: bool
+    ) -> str:
+        attrs = self._render_attr(options)
+        close = " />" if empty else ">"
+        if indent is None:
+            return f"<{self.tag_name}{attrs}{close}"
+        return f"{indent}<{self.tag_name}{attrs}{close}\n"
+
+    def _end_tag(self, indent: str | None) -> str:
+        if indent is None:
+            return f"</{self.tag_name}>"
+        return f"{indent}</{self.tag_name}>\n"
+
+    @classmethod
+    def _attr_plan(cls) -> AttrPlan:
+        """How to render the attributes of this class.
+
+        Computed once per class: an ordered table of
+        (field name, attribute name / prefix, kind).
+        """
+        plan = _ATTR_PLANS.get(cls)
+        if plan is not None:
+            return plan
+
+        dict_fields = dict(cls._ATTR_DICTS)
+        entries: list[tuple[str, str, int]] = []
+        for field_ in cls._FIELDS.values():
+            if (
+                field_.name == "children"
+                or field_.name in dict_fields
+                or field_.name.startswith("_")
+            ):
                 continue
-            elif isinstance(child, str):
-                result += f"{indent or ''}{escape(child)}"
-                if indent is not None:
-                    result += "\n"
+            name = field_.name
+            if name.endswith("_"):
+                # e.g. class_ -> class
+                name = name[:-1]
+            # e.g. accept_charset -> accept-charset
+            name = name.replace("_", "-")
+            entries.append((field_.name, name, _ATTR_VALUE))
+
+        for field_name, prefix in cls._ATTR_DICTS:
+            entries.append((field_name, prefix, _ATTR_DICT))
+
+        plan = _ATTR_PLANS[cls] = tuple(entries)
+        return plan
+
+    @classmethod
+    def _attr_index(cls) -> AttrIndex:
+        """The attribute plan by field name, see `_render_attr`."""
+        index = _ATTR_INDEXES.get(cls)
+        if index is not None:
+            return index
+
+        entries = {
+            field_name: (pos, name, kind)
+            for pos, (field_name, name, kind) in enumerate(cls._attr_plan())
+        }
+        # fields are None or False by default, but subclasses can
+        # declare defaults, that have to be rendered
+        defaults = []
+        for field_ in cls._FIELDS.values():
+            entry = entries.get(field_.name)
+            if entry is not None and entry[2] is _ATTR_VALUE:
+                if field_.default not in (None, False, MISSING):
+                    defaults.append((field_.name, entry, field_.default))
+
+        index = _ATTR_INDEXES[cls] = (entries, tuple(defaults))
+        return index
+
+    def _render_attr(self, options: RenderOptions) -> str:
+        # only the fields set on the node, in the order of the plan
+        entries, defaults = self._attr_index()
+        stored = self.__dict__
+        found = [
+            (entry, value)
+            for field_name, value in stored.items()
+            if (entry := entries.get(field_name)) is not None
+            and value is not None
+            and value is not False
+        ]
+        for field_name, entry, default in defaults:
+            if field_name not in stored:
+                found.append((entry, default))
+        if not found:
+            return ""
+        if len(found) > 1:
+            found.sort(key=_entry_position)
+
+        result: list[str] = []
+        for (_, name, kind), value in found:
+            if kind is _ATTR_VALUE:
+                result.append(self._render_single_attr(name, value, options))
             else:
-                result += child.do_render(indent)
-        return result
-
-    def _render_attr(self) -> str:
-        result = ""
-        for field_ in fields(self):
-            if field_.name in (
-                "tag_name",
-                "children",
-                "aria_attr",
-                "data_attr",
-                "attr",
-            ) or field_.name.startswith("_"):
-                continue
-            value = getattr(self, field_.name)
-            if value is not None and value is not False:
-                name = field_.name
-                if name.endswith("_"):
-                    # e.g. class_ -> class
-                    name = name[:-1]
-                # e.g. accept_charset -> accept-charset
-                name = name.replace("_", "-")
-                result += self._render_single_attr(name, value)
-
-        for name, value in self.attr.items():
-            result += self._render_single_attr(name, value)
-
-        return result
-
-    def _render_single_attr(self, name: str, value: str | bool) -> str:
+                for key, item in value.items():
+                    result.append(self._render_single_attr(name + key, item, options))
+        return "".join(result)
+
+    def _render_single_attr(
+        self, name: str, value: str | bool, options: RenderOptions
+    ) -> str:
         if isinstance(value, bool):
             if value is True:
-                if DOMConfig.FULL_XHTML:
-                    return f' {name}="{name}"'
-                else:
-                    return f" {name}"
+                return options.bool_attr(name)
             # False will be ignored
             return ""
+        elif isinstance(value, NoEscape):
+            return f' {name}="{value.content}"'
         else:
-            return f' {name}="{value}"'
+            return f' {name}="{escape_attr(str(value))}"'
 
 
 @dataclass
@@ -157,3 +1086,401 @@ class NoEscape(CanRender):
 
     def do_render(self, indent: str | None) -> str:
         return self.content
+
+
+# fields of a class: name -> (declared position, default), the default
+# of a field with a default factory is a value created by it
+_FieldOrder = dict[str, tuple[int, Any]]
+_FIELD_ORDER: dict[type, _FieldOrder] = {}
+
+
+def _field_order(cls: type[Node]) -> _FieldOrder:
+    order = _FIELD_ORDER.get(cls)
+    if order is None:
+        order = {}
+        for pos, field_ in enumerate(cls._FIELDS.values()):
+            default = field_.default
+            if field_.default_factory is not MISSING:
+                default = field_.default_factory()
+            order[field_.name] = (pos, default)
+        _FIELD_ORDER[cls] = order
+    return order
+
+
+def _set_fields(node: Node) -> list[tuple[str, Any]]:
+    """The stored fields of `node`, that differ from their defaults.
+
+    Only looks at the fields in the instance dict, sorted by declaration.
+    """
+    order = _field_order(type(node))
+    found = []
+    for name, value in node.__dict__.items():
+        entry = order.get(name)
+        if entry is not None and value is not entry[1] and value != entry[1]:
+            found.append((entry[0], name, value))
+    found.sort()
+    return [(name, value) for _, name, value in found]
+
+
+def _entry_position(item: tuple[AttrEntry, Any]) -> int:
+    return item[0][0]
+
+
+def _compared_fields(node: Node) -> list[tuple[str, Any]]:
+    node_fields = type(node)._FIELDS
+    return [
+        (name, value) for name, value in _set_fields(node) if node_fields[name].compare
+    ]
+
+
+# caches of a node, that are not copied or sent to other processes
+_CACHED_FIELDS = ("_fingerprint", "_index", "_stamps")
+
+
+def _children(node: Node) -> Elements:
+    # without creating the default list of a node without children
+    return cast(Elements, node.__dict__.get("children", ()))
+
+
+def _state(node: Node) -> dict[str, Any]:
+    """The set fields of a node without the caches."""
+    state = node.__dict__.copy()
+    for name in _CACHED_FIELDS:
+        state.pop(name, None)
+    return state
+
+
+def _restore(cls: type[Node], state: dict[str, Any]) -> Node:
+    """Create a node from its set fields."""
+    node = cls.__new__(cls)
+    node.__dict__.update(state)
+    return node
+
+
+# a node in `_flatten`: the class, the set fields without children, the
+# children with None for nodes (None without children) and the positions
+# of the nodes with their entries
+_FlatNode = tuple[type[Node], dict[str, Any], Elements | None, list[tuple[int, int]]]
+
+
+def _flatten(root: Node) -> list[_FlatNode]:
+    """The nodes of the subtree in breadth first order, see `Node.__reduce__`.
+
+    Nodes used more than once have one entry, like in pickle.
+    """
+    entries: list[_FlatNode] = []
+    positions = {id(root): 0}
+    queue = [root]
+    # the queue grows while it is iterated
+    for node in queue:
+        state = _state(node)
+        children = state.pop("children", None)
+        refs = []
+        if children is not None:
+            items = list(children)
+            for pos, child in enumerate(items):
+                if isinstance(child, Node):
+                    entry = positions.get(id(child))
+                    if entry is None:
+                        entry = positions[id(child)] = len(queue)
+                        queue.append(child)
+                    refs.append((pos, entry))
+                    items[pos] = None
+            # other sequences, e.g. set directly, become tuples
+            children = items if isinstance(children, list) else tuple(items)
+        entries.append((type(node), state, children, refs))
+    return entries
+
+
+def _restore_tree(entries: list[_FlatNode]) -> Node:
+    """Create the subtree from `_flatten`."""
+    nodes = [_restore(cls, state) for cls, state, _, _ in entries]
+    for node, (_, _, children, refs) in zip(nodes, entries, strict=True):
+        if children is not None:
+            items = list(children)
+            for pos, entry in refs:
+                items[pos] = nodes[entry]
+            node.__dict__["children"] = (
+                items if isinstance(children, list) else tuple(items)
+            )
+    return nodes[0]
+
+
+# render in parallel from this number of children on
+_PARALLEL_MIN_CHILDREN = 2
+# batches of children per worker, to even out the load
+_PARALLEL_BATCHES = 4
+
+
+def _render_parallel(
+    root: Node, options: RenderOptions, executor: Executor, min_children: int
+) -> str:
+    path = None
+    if not options.minify and not type(root)._RENDERS_ITSELF:
+        # minified text and end tags depend on the parents and siblings
+        path = _parallel_path(root, max(min_children, _PARALLEL_MIN_CHILDREN))
+    if path is None:
+        return "".join(root._iter_parts(options, 0))
+
+    split = path[-1]
+    content = list(split._content())
+    size = -(-len(content) // (min_children * _PARALLEL_BATCHES))
+    batches = [content[i : i + size] for i in range(0, len(content), size)]
+    futures = [
+        executor.submit(_render_batch, batch, options, len(path)) for batch in batches
+    ]
+    rendered: Elements = [NoEscape(future.result()) for future in futures]
+
+    # copy the path from the root to `split` with the rendered children
+    for original in reversed(path):
+        node = copy(original)
+        object.__setattr__(node, "children", rendered)
+        rendered = [node]
+    return "".join(cast(Node, rendered[0])._iter_parts(options, 0))
+
+
+def _parallel_path(root: Node, min_children: int) -> list[Node] | None:
+    """The nodes from `root` to the node to render in parallel."""
+    path = [root]
+    node = root
+    while True:
+        content = node._content()
+        if len(content) >= min_children:
+            return path
+        candidates = [
+            child
+            for child in content
+            if isinstance(child, Node) and not type(child)._RENDERS_ITSELF
+        ]
+        if not candidates:
+            return None
+        node = max(candidates, key=lambda child: len(_children(child)))
+        path.append(node)
+
+
+def _render_batch(children: Elements, options: RenderOptions, depth: int) -> str:
+    """Render `children` at `depth` in a worker process."""
+    parts: list[str] = []
+    for child in children:
+        if isinstance(child, Node):
+            parts.extend(child._iter_parts(options, depth))
+        elif isinstance(child, str):
+            parts.append(_render_text(child, options.indent_at(depth)))
+        elif child is not None:
+            parts.append(_render_other(child, options.indent_at(depth)))
+    return "".join(parts)
+
+
+def _fingerprint_tree(root: Node) -> None:
+    """Compute the missing fingerprints in the tree below `root`.
+
+    The computed ones share a new stamp, that is invalidated by changing
+    any of their nodes or by the stamps of reused fingerprints.
+    """
+    stamp = _Stamp()
+    stack = [(root, _node_hash(root), iter(_children(root)))]
+    while stack:
+        node, hasher, children = stack[-1]
+        for child in children:
+            if isinstance(child, Frozen):
+                # immutable
+                _hash_part(hasher, b"N", child._digest())
+            elif isinstance(child, Node):
+                cached = child._fingerprint
+                if cached is None or not cached[1].valid:
+                    # descend, the parent is updated when `child` is done
+                    stack.append((child, _node_hash(child), iter(_children(child))))
+                    break
+                cached[1].add_dependent(stamp)
+                _hash_part(hasher, b"N", cached[0])
+            else:
+                _hash_leaf(hasher, child)
+        else:
+            stack.pop()
+            digest = hasher.digest()
+            node._fingerprint = (digest, stamp)
+            _mark(node, stamp)
+            if stack:
+                _hash_part(stack[-1][1], b"N", digest)
+
+
+def _hash_leaf(hasher: hashlib.blake2b, child: Element) -> None:
+    if isinstance(child, str):
+        _hash_part(hasher, b"S", child.encode("utf-8", "surrogatepass"))
+    elif isinstance(child, NoEscape):
+        _hash_part(hasher, b"R", child.content.encode("utf-8", "surrogatepass"))
+    elif isinstance(child, Awaitable):
+        raise TypeError("Awaitable children cannot be fingerprinted.")
+    elif child is not None:
+        _hash_part(hasher, b"R", child.do_render(None).encode())
+
+
+def _node_hash(node: Node) -> hashlib.blake2b:
+    cls = type(node)
+    hasher = hashlib.blake2b(digest_size=16)
+    _hash_part(hasher, b"C", f"{cls.__module__}.{cls.__qualname__}".encode())
+    _hash_part(hasher, b"T", node.tag_name.encode())
+    for name, value in _compared_fields(node):
+        if name != "children":
+            _hash_part(hasher, b"A", repr((name, value)).encode())
+    return hasher
+
+
+def _hash_part(hasher: hashlib.blake2b, kind: bytes, data: bytes) -> None:
+    # prefix with the length, e.g. children "ab" differ from "a", "b"
+    hasher.update(kind + len(data).to_bytes(8, "little") + data)
+
+
+class Frozen(Node):
+    """A prerendered, immutable node. See `Node.freeze`."""
+
+    # compared, frozen nodes are equal by their nodes
+    _node: Node = field(init=False)
+    # (options, depth) or (options, keep space, omit end tag) on minify
+    _cache: dict[tuple[Any, ...], str] = field(init=False, compare=False)
+
+    def __init__(self, node: Node) -> None:
+        super(Frozen, self).__init__()
+        self._node = node
+        self._cache = {}
+
+    def __getitem__(self, child: Element | Elements) -> Self:
+        raise TypeError("Frozen nodes cannot be changed.")
+
+    @property
+    def tag_name(self) -> str:
+        return self._node.tag_name
+
+    def freeze(self) -> "Frozen":
+        return self
+
+    def _digest(self) -> bytes:
+        return self._node._digest()
+
+    def _iter_parts(self, options: RenderOptions, depth: int) -> Iterator[str]:
+        key = (options, depth)
+        result = self._cache.get(key)
+        if result is None:
+            result = self._cache[key] = "".join(self._node._iter_parts(options, depth))
+        yield result
+
+    def _iter_minified_parts(
+        self,
+        options: RenderOptions,
+        keep_space: bool,
+        next_sibling: Element,
+        parent: Node | None,
+    ) -> Iterator[str]:
+        node = self._node
+        # the output only depends on the place by these two
+        key = (options, keep_space, node._omit_end_tag(next_sibling, parent))
+        result = self._cache.get(key)
+        if result is None:
+            result = self._cache[key] = "".join(
+                node._iter_minified_parts(options, keep_space, next_sibling, parent)
+            )
+        yield result
+
+
+def _schedule(
+    element: Element | Elements,
+    tasks: dict[int, asyncio.Future[Any]],
+    pending: set[int],
+) -> bool:
+    """Start all awaitables in `element` as tasks.
+
+    Nodes with awaitables in their subtree are added to `pending`.
+    Returns whether there are awaitables in `element`.
+    """
+    import asyncio  # noqa: PLC0415
+
+    found = False
+    # id of a node -> id of its parent node
+    parents: dict[int, int | None] = {}
+    stack: list[tuple[Element | Elements, int | None]] = [(element, None)]
+    while stack:
+        item, parent = stack.pop()
+        if isinstance(item, Node):
+            parents[id(item)] = parent
+            stack.extend((child, id(item)) for child in reversed(_children(item)))
+        elif isinstance(item, Awaitable):
+            found = True
+            if id(item) not in tasks:
+                tasks[id(item)] = asyncio.ensure_future(item)
+            while parent is not None and parent not in pending:
+                pending.add(parent)
+                parent = parents[parent]
+        elif isinstance(item, Sequence) and not isinstance(item, str):
+            stack.extend((child, parent) for child in reversed(item))
+    return found
+
+
+async def _aiter_parts(
+    node: Node,
+    options: RenderOptions,
+    depth: int,
+    tasks: dict[int, asyncio.Future[Any]],
+    pending: set[int],
+) -> AsyncIterator[str]:
+    """Same as `Node._iter_parts`, but awaits the awaitable children."""
+    if id(node) not in pending or type(node)._RENDERS_ITSELF:
+        # nothing to wait for in this subtree, or rendered by the node
+        for part in node._iter_parts(options, depth):
+            yield part
+        return
+
+    prologue = node._prologue(options)
+    if prologue:
+        yield prologue
+
+    indent = options.indent_at(depth)
+    children = node._content()
+    if not children:
+        yield node._start_tag(options, indent, empty=True)
+        return
+
+    yield node._start_tag(options, indent, empty=False)
+    for child in children:
+        async for part in _aiter_child(child, options, depth + 1, tasks, pending):
+            yield part
+    yield node._end_tag(indent)
+
+
+async def _aiter_child(
+    child: Element | Elements,
+    options: RenderOptions,
+    depth: int,
+    tasks: dict[int, asyncio.Future[Any]],
+    pending: set[int],
+) -> AsyncIterator[str]:
+    if isinstance(child, str):
+        yield _render_text(child, options.indent_at(depth))
+    elif isinstance(child, Node):
+        async for part in _aiter_parts(child, options, depth, tasks, pending):
+            yield part
+    elif isinstance(child, Awaitable):
+        value = await _resolve(child, tasks, pending)
+        async for part in _aiter_child(value, options, depth, tasks, pending):
+            yield part
+    elif isinstance(child, Sequence):
+        for item in child:
+            async for part in _aiter_child(item, options, depth, tasks, pending):
+                yield part
+    elif child is not None:
+        yield child.do_render(options.indent_at(depth))
+
+
+async def _resolve(
+    child: Awaitable[Any],
+    tasks: dict[int, asyncio.Future[Any]],
+    pending: set[int],
+) -> Any:
+    task = tasks.pop(id(child), None)
+    if task is None:
+        import asyncio  # noqa: PLC0415
+
+        task = asyncio.ensure_future(child)
+    value = await task
+    # the result can have awaitables as well
+    _schedule(value, tasks, pending)
+    return value
@@ -0,0 +1,122 @@
+"""Render many pages to files, e.g. for static sites.
+
+Usage:
+    report = build([("out/index.html", index), ("out/about.html", about_page)])
+    print(report.summary())
+
+Pages are nodes or functions returning a node. Files, that already have
+the rendered content, are not written again, so their modification
+time stays the same.
+"""
+
+import hashlib
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .base import Node, RenderOptions, _options, _write_file
+
+Page = Node | Callable[[], Node]
+
+
+@dataclass(frozen=True, slots=True)
+class PageResult:
+    path: Path
+    # rendering, comparing and writing
+    seconds: float
+    size: int
+    written: bool
+
+
+@dataclass(frozen=True, slots=True)
+class BuildReport:
+    pages: list[PageResult]
+    # wall time of the whole build
+    seconds: float
+
+    @property
+    def written(self) -> list[PageResult]:
+        return [page for page in self.pages if page.written]
+
+    @property
+    def unchanged(self) -> list[PageResult]:
+        return [page for page in self.pages if not page.written]
+
+    def summary(self) -> str:
+        size = sum(page.size for page in self.pages)
+        seconds = self.seconds or 1e-9
+        return (
+            f"{len(self.pages)} pages ({len(self.written)} written, "
+            f"{len(self.unchanged)} unchanged), {size / 2**20:.1f} MB "
+            f"in {self.seconds:.2f}s: {len(self.pages) / seconds:.1f} pages/s, "
+            f"{size / 2**20 / seconds:.1f} MB/s"
+        )
+
+
+def build(
+    pages: Iterable[tuple[str | os.PathLike[str], Page]],
+    indent: bool = False,
+    options: RenderOptions | None = None,
+    workers: int | Executor | None = None,
+) -> BuildReport:
+    """Render each page into the file at its path.
+
+    Without `workers` the pages are rendered one after the other, with a
+    number of processes or an executor in parallel. For processes, the
+    nodes and page functions have to be picklable, i.e. functions defined
+    on module level.
+
+    A page is only written, if the hash of its rendered content differs
+    from the hash of the file on disk. Files are replaced atomically.
+    """
+    options = _options(indent, options)
+    jobs = [(Path(path), page) for path, page in pages]
+    start = time.perf_counter()
+
+    if workers is None:
+        results = [_build_page(path, page, options) for path, page in jobs]
+    elif isinstance(workers, int):
+        with ProcessPoolExecutor(workers) as executor:
+            results = _submit(executor, jobs, options)
+    else:
+        results = _submit(workers, jobs, options)
+
+    return BuildReport(pages=results, seconds=time.perf_counter() - start)
+
+
+def _submit(
+    executor: Executor, jobs: list[tuple[Path, Page]], options: RenderOptions
+) -> list[PageResult]:
+    futures = [executor.submit(_build_page, path, page, options) for path, page in jobs]
+    return [future.result() for future in futures]
+
+
+def _build_page(path: Path, page: Page, options: RenderOptions) -> PageResult:
+    start = time.perf_counter()
+    node = page if isinstance(page, Node) else page()
+    content = node.render_bytes(options=options, encoding=options.encoding)
+
+    written = not _has_content(path, content)
+    if written:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_file(path, (content,), 64 * 1024, atomic=True)
+    return PageResult(
+        path=path,
+        seconds=time.perf_counter() - start,
+        size=len(content),
+        written=written,
+    )
+
+
+def _has_content(path: Path, content: bytes) -> bool:
+    try:
+        if path.stat().st_size != len(content):
+            return False
+        with open(path, "rb") as f:
+            digest = hashlib.file_digest(f, "blake2b").digest()
+    except FileNotFoundError:
+        return False
+    return digest == hashlib.blake2b(content).digest()
@@ -0,0 +1,319 @@
+"""Benchmarks of building and rendering trees.
+
+Usage:
+    python -m tagic.bench --output results.json
+    python -m tagic.bench --baseline results.json
+
+Only uses the standard library. Every case is timed `--repeat` times,
+the peak memory is measured in a separate run with `tracemalloc`, but
+not for cases running in other processes.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, TypedDict
+
+from . import html as h
+from .base import Node
+from .xml import XML
+
+Bench = Callable[[], object]
+# creates the function to time, sizes are multiplied by `scale`
+Setup = Callable[[float], Bench]
+
+CASES: dict[str, Setup] = {}
+# cases without peak memory, e.g. running in a subprocess
+UNTRACED: set[str] = set()
+
+
+class Result(TypedDict):
+    min: float
+    median: float
+    # bytes, None if not measured
+    peak_memory: int | None
+
+
+def case(name: str, memory: bool = True) -> Callable[[Setup], Setup]:
+    """Register a benchmark case, `memory` is whether to measure its peak."""
+
+    def register(setup: Setup) -> Setup:
+        CASES[name] = setup
+        if not memory:
+            UNTRACED.add(name)
+        return setup
+
+    return register
+
+
+def _n(count: int, scale: float) -> int:
+    return max(1, int(count * scale))
+
+
+def _page(sections: int) -> Node:
+    return h.html[
+        h.head[h.title["Benchmark"], h.meta(charset="utf-8")],
+        h.body[
+            h.header(id="header", class_="top")[h.h1["Benchmark & Co"]],
+            h.main[
+                [
+                    h.section(id=f"s{i}", class_="section")[
+                        h.h2[f"Section {i}"],
+                        h.p["Some text ", h.span["with tags"], " in between."],
+                        h.ul[
+                            [
+                                h.li[h.a(href=f"/item/{j}")[f"item {j}"]]
+                                for j in range(10)
+                            ]
+                        ],
+                    ]
+                    for i in range(sections)
+                ]
+            ],
+            h.footer(hidden=True),
+        ],
+    ]
+
+
+def _table(rows: int, cols: int) -> Node:
+    return h.table(class_="report")[
+        h.thead[h.tr[[h.th[f"col {c}"] for c in range(cols)]]],
+        h.tbody[
+            [h.tr[[h.td[str(r * cols + c)] for c in range(cols)]] for r in range(rows)]
+        ],
+    ]
+
+
+def _deep(depth: int) -> Node:
+    node: Node = h.span["leaf"]
+    for i in range(depth):
+        node = h.div(class_=f"level-{i}")[node]
+    return node
+
+
+@case("construct_page")
+def _construct_page(scale: float) -> Bench:
+    sections = _n(200, scale)
+    return lambda: _page(sections)
+
+
+@case("construct_table_100k")
+def _construct_table(scale: float) -> Bench:
+    rows = _n(10_000, scale)
+    return lambda: _table(rows, 10)
+
+
+@case("render_page")
+def _render_page(scale: float) -> Bench:
+    page: Node = _page(_n(200, scale))
+    return page.render
+
+
+@case("render_page_indent")
+def _render_page_indent(scale: float) -> Bench:
+    page: Node = _page(_n(200, scale))
+    return lambda: page.render(indent=True)
+
+
+@case("render_table_100k")
+def _render_table(scale: float) -> Bench:
+    table: Node = _table(_n(10_000, scale), 10)
+    return table.render
+
+
+@case("data_table_100k")
+def _data_table(scale: float) -> Bench:
+    rows = _n(10_000, scale)
+
+    def bench() -> str:
+        # the same output as `_table`, built and rendered
+        values = ([str(r * 10 + c) for c in range(10)] for r in range(rows))
+        columns = [f"col {c}" for c in range(10)]
+        return h.DataTable(values, columns, class_="report").render()
+
+    return bench
+
+
+@case("render_deep")
+def _render_deep(scale: float) -> Bench:
+    tree: Node = h.div[[_deep(200) for _ in range(_n(50, scale))]]
+    return tree.render
+
+
+@case("render_wide")
+def _render_wide(scale: float) -> Bench:
+    tree: Node = h.div[[h.span(id=f"i{i}")[str(i)] for i in range(_n(50_000, scale))]]
+    return tree.render
+
+
+@case("render_hx_attributes")
+def _render_hx(scale: float) -> Bench:
+    tree: Node = h.div[
+        [
+            h.button(
+                id=f"b{i}",
+                class_="btn",
+                hx_post=f"/items/{i}",
+                hx_target=f"#row-{i}",
+                hx_swap="outerHTML",
+                hx_trigger="click",
+                hx_confirm="Sure?",
+                hx_vals='{"a": 1}',
+                data_attr={"index": str(i)},
+                aria_attr={"label": f"item {i}"},
+            )["Go"]
+            for i in range(_n(10_000, scale))
+        ]
+    ]
+    return tree.render
+
+
+@case("render_xml_feed")
+def _render_xml(scale: float) -> Bench:
+    feed: Node = XML(
+        "feed", attrs={"xmlns": "http://www.w3.org/2005/Atom"}, is_root=True
+    )[
+        [
+            XML("entry")[
+                XML("id")[f"urn:uuid:{i}"],
+                XML("title")[f"Entry {i} & more"],
+                XML("link", attrs={"href": f"https://example.com/{i}"}),
+                XML("content", attrs={"type": "text"})["Lorem ipsum " * 5],
+            ]
+            for i in range(_n(20_000, scale))
+        ]
+    ]
+    return feed.render
+
+
+@case("import_html", memory=False)
+def _import_html(scale: float) -> Bench:
+    # a fresh interpreter per run, includes the start of python itself,
+    # its memory is not seen by `tracemalloc`
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).parent.parent)}
+    command = [sys.executable, "-c", "import tagic.html"]
+    return lambda: subprocess.run(command, env=env, check=True)
+
+
+def run_case(setup: Setup, scale: float, repeat: int, memory: bool = True) -> Result:
+    bench = setup(scale)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        bench()
+        times.append(time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            setup(scale)()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "peak_memory": peak,
+    }
+
+
+def _megabytes(peak: int | None) -> str:
+    return "-" if peak is None else f"{peak / 2**20:.1f}"
+
+
+def compare(
+    results: dict[str, Result],
+    baseline: dict[str, Result],
+    threshold: float,
+) -> list[str]:
+    """Print the results relative to the baseline.
+
+    Returns the cases, that got slower by more than `threshold`.
+    """
+    slower = []
+    print(
+        f"{'case':<24} {'min [s]':>10} {'baseline':>10} {'ratio':>7} {'peak [MB]':>10}"
+    )
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<24} {result['min']:>10.4f} {'-':>10} {'-':>7}")
+            continue
+        ratio = result["min"] / base["min"]
+        mark = ""
+        if ratio > 1 + threshold:
+            slower.append(name)
+            mark = " slower"
+        print(
+            f"{name:<24} {result['min']:>10.4f} {base['min']:>10.4f} "
+            f"{ratio:>7.2f} {_megabytes(result['peak_memory']):>10}{mark}"
+        )
+    return slower
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m tagic.bench", description=__doc__)
+    parser.add_argument(
+        "cases", nargs="*", help=f"cases to run, from: {', '.join(CASES)}"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="factor for the sizes")
+    parser.add_argument("--output", type=Path, help="write the results as json")
+    parser.add_argument("--baseline", type=Path, help="json results to compare to")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="fail, if a case is slower than the baseline by this fraction",
+    )
+    args = parser.parse_args(argv)
+
+    names = args.cases or list(CASES)
+    if unknown := set(names) - CASES.keys():
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    results = {}
+    for name in names:
+        results[name] = run_case(
+            CASES[name], args.scale, args.repeat, name not in UNTRACED
+        )
+        print(
+            f"{name:<24} min {results[name]['min']:.4f}s "
+            f"median {results[name]['median']:.4f}s "
+            f"peak {_megabytes(results[name]['peak_memory'])} MB",
+            file=sys.stderr,
+        )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "scale": args.scale,
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline["scale"] != args.scale:
+            parser.error(f"the baseline was run with --scale {baseline['scale']}")
+        if compare(results, baseline["results"], args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
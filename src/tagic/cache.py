@@ -0,0 +1,110 @@
+"""Cache the output of component functions.
+
+Usage:
+    @cached_component(maxsize=1024, ttl=60)
+    def user_badge(user_id: int) -> Node:
+        user = load_user(user_id)
+        return span(class_="badge")[user.name]
+
+Calls with the same arguments return the same frozen node, that renders
+its subtree only once per indent level and config.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import update_wrapper
+from typing import Any, Callable, Generic, Hashable, NamedTuple, ParamSpec
+
+from .base import Frozen, Node
+
+P = ParamSpec("P")
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+class CachedComponent(Generic[P]):
+    """A component function with a cache, see `cached_component`."""
+
+    def __init__(
+        self, func: Callable[P, Node], maxsize: int | None, ttl: float | None
+    ) -> None:
+        self._func = func
+        self._maxsize = maxsize
+        self._ttl = ttl
+        # key -> (expiry time or None, node), the most recent used last
+        self._cache: OrderedDict[Hashable, tuple[float | None, Frozen]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        update_wrapper(self, func)
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> Frozen:
+        key = _make_key(args, kwargs)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                expires, node = entry
+                if expires is None or time.monotonic() < expires:
+                    self._cache.move_to_end(key)
+                    self._hits += 1
+                    return node
+                del self._cache[key]
+            self._misses += 1
+
+        # build outside of the lock, concurrent misses of the same key
+        # build it twice, the last one is kept
+        node = self._func(*args, **kwargs).freeze()
+        expires = None if self._ttl is None else time.monotonic() + self._ttl
+        with self._lock:
+            self._cache[key] = (expires, node)
+            self._cache.move_to_end(key)
+            if self._maxsize is not None and len(self._cache) > self._maxsize:
+                self._cache.popitem(last=False)
+        return node
+
+    def cache_info(self) -> CacheInfo:
+        """Statistics of the cache, like `functools.lru_cache`."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._cache))
+
+    def cache_clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            self._cache.clear()
+            self._hits = self._misses = 0
+
+
+def cached_component(
+    maxsize: int | None = 128, ttl: float | None = None
+) -> Callable[[Callable[P, Node]], CachedComponent[P]]:
+    """Cache the nodes of a component function per arguments.
+
+    The arguments have to be hashable. The result of the function is
+    frozen (see `Node.freeze`), so it cannot be changed and its output
+    is rendered only once. At most `maxsize` results are kept, the least
+    recently used are dropped first (`None` is unbounded). With `ttl`,
+    results expire after that many seconds.
+    """
+    if maxsize is not None and maxsize < 1:
+        raise ValueError("maxsize has to be at least 1 or None.")
+
+    def decorator(func: Callable[P, Node]) -> CachedComponent[P]:
+        return CachedComponent(func, maxsize, ttl)
+
+    return decorator
+
+
+# separates the positional from the keyword arguments in keys
+_KWARGS_MARK = object()
+
+
+def _make_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+    if not kwargs:
+        return args
+    return (*args, _KWARGS_MARK, *sorted(kwargs.items()))
@@ -0,0 +1,108 @@
+"""Send only the changed parts of a page, as htmx out-of-band swaps.
+
+Usage:
+    fragments = diff(old_panel, new_panel)
+    return HttpResponse("".join(fragments))
+
+Nodes are matched by their position and `id`. A change is sent as the
+smallest element with an `id` around it, as htmx swaps elements by id.
+"""
+
+from copy import copy
+
+from .base import Element, Frozen, Node, RenderOptions, _compared_fields, _options
+from .html import HTMLElement
+
+
+def diff(
+    old: Node,
+    new: Node,
+    indent: bool = False,
+    options: RenderOptions | None = None,
+) -> list[str]:
+    """Render the changed subtrees of `new` compared to `old`.
+
+    Each fragment is an element with an `id` and `hx-swap-oob="true"`,
+    in document order. Identical subtrees are skipped by their
+    `fingerprint` without rendering. Raises ValueError, if the root
+    changed itself (e.g. its attributes) and has no `id`.
+    """
+    options = _options(indent, options)
+    swaps: list[HTMLElement] = []
+    if _diff(old, new, swaps):
+        root = _id_node(new)
+        if root is None or root.id != _id_of(old):
+            raise ValueError("The root changed and cannot be swapped by its id.")
+        swaps = [root]
+    return [_oob(node).render(options=options) for node in swaps]
+
+
+def _diff(old: Node, new: Node, swaps: list[HTMLElement]) -> bool:
+    """Add the swaps for the changes from `old` to `new`.
+
+    Returns True, if the change needs to be sent by the next element
+    with an id around `new`.
+    """
+    if old._digest() == new._digest():
+        return False
+    old, new = _unwrap(old), _unwrap(new)
+    if type(old) is not type(new) or _own_fields(old) != _own_fields(new):
+        return True
+
+    old_content, new_content = old._content(), new._content()
+    if len(old_content) != len(new_content):
+        return True
+
+    found: list[HTMLElement] = []
+    for old_child, new_child in zip(old_content, new_content, strict=True):
+        if _child_changed(old_child, new_child, found):
+            return True
+    swaps.extend(found)
+    return False
+
+
+def _child_changed(old: Element, new: Element, swaps: list[HTMLElement]) -> bool:
+    if not isinstance(old, Node) or not isinstance(new, Node):
+        return bool(old != new)
+
+    node_id = _id_of(new)
+    if node_id != _id_of(old):
+        # a different element at this place
+        return True
+    if _diff(old, new, swaps):
+        node = _id_node(new)
+        if node is None:
+            return True
+        swaps.append(node)
+    return False
+
+
+def _unwrap(node: Node) -> Node:
+    while isinstance(node, Frozen):
+        node = node._node
+    return node
+
+
+def _id_node(node: Node) -> HTMLElement | None:
+    node = _unwrap(node)
+    if isinstance(node, HTMLElement) and node.id:
+        return node
+    return None
+
+
+def _id_of(node: Node) -> str | None:
+    id_node = _id_node(node)
+    return None if id_node is None else id_node.id
+
+
+def _own_fields(node: Node) -> list[tuple[str, object]]:
+    return [
+        (name, value) for name, value in _compared_fields(node) if name != "children"
+    ]
+
+
+def _oob(node: HTMLElement) -> HTMLElement:
+    # a copy, the new tree is not changed
+    node = copy(node)
+    node.hx_swap_oob = "true"
+    return node
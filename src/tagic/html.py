@@ -1,12 +1,122 @@
-from dataclasses import dataclass, field
-from typing import Literal
-
-from .base import DOMConfig, Node, NoEscape, _not_none
+from __future__ import annotations
+
+import re
+from dataclasses import field
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Iterable,
+    Iterator,
+    Literal,
+    Mapping,
+    NamedTuple,
+    Sequence,
+)
+
+from .base import (
+    _WHITESPACE,
+    Element,
+    Elements,
+    Node,
+    NoEscape,
+    RenderOptions,
+    _children,
+    _render_other,
+    _render_text,
+    escape_attr,
+    escape_text,
+)
 
 BoolVals = Literal["true", "false"]
 
+_VOID_TAGS = frozenset(
+    (
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "source",
+        "track",
+        "wbr",
+    )
+)
+_RAW_TAGS = frozenset(("script", "style"))
+# whitespace in their text is kept on minify
+_KEEP_SPACE_TAGS = frozenset(("pre", "textarea", "script", "style"))
+
+# On minify, the end tags of these can be left out, if the next sibling
+# has one of the tags, is any element ("*") or there is none (None), see
+# https://html.spec.whatwg.org/multipage/syntax.html#optional-tags
+_P_CLOSERS = frozenset(
+    (
+        "address",
+        "article",
+        "aside",
+        "blockquote",
+        "details",
+        "dialog",
+        "div",
+        "dl",
+        "fieldset",
+        "figcaption",
+        "figure",
+        "footer",
+        "form",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "hgroup",
+        "hr",
+        "main",
+        "menu",
+        "nav",
+        "ol",
+        "p",
+        "pre",
+        "search",
+        "section",
+        "table",
+        "ul",
+    )
+)
+_OPTIONAL_END_TAGS: dict[str, frozenset[str | None]] = {
+    "html": frozenset(("*", None)),
+    "head": frozenset(("*", None)),
+    "body": frozenset(("*", None)),
+    "li": frozenset(("li", None)),
+    "dt": frozenset(("dt", "dd")),
+    "dd": frozenset(("dd", "dt", None)),
+    "p": _P_CLOSERS | {None},
+    "rt": frozenset(("rt", "rp", None)),
+    "rp": frozenset(("rt", "rp", None)),
+    "optgroup": frozenset(("optgroup", "hr", None)),
+    "option": frozenset(("option", "optgroup", "hr", None)),
+    "colgroup": frozenset(("*", None)),
+    "caption": frozenset(("*", None)),
+    "thead": frozenset(("tbody", "tfoot")),
+    "tbody": frozenset(("tbody", "tfoot", None)),
+    "tfoot": frozenset((None,)),
+    "tr": frozenset(("tr", None)),
+    "td": frozenset(("td", "th", None)),
+    "th": frozenset(("td", "th", None)),
+}
+# the end tag of a p as last child of these is needed
+_P_KEEP_IN = frozenset(("a", "audio", "del", "ins", "map", "noscript", "video"))
+# attribute values, that need no quotes
+_UNQUOTED = re.compile("[^ \t\n\r\f\"'=<>`]+")
+
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class HTMLElement(Node):
     """Base HTML Element.
 
@@ -520,6 +630,12 @@ class HTMLElement(Node):
        see https://htmx.org/attributes/hx-ws/
     """
 
+    _ATTR_DICTS: ClassVar[tuple[tuple[str, str], ...]] = (
+        ("attr", ""),
+        ("data_attr", "data-"),
+        ("aria_attr", "aria-"),
+    )
+
     def add_class(self, *classes: str) -> None:
         """Add classes to the 'class' attribute of the tag.
 
@@ -536,6 +652,7 @@ class HTMLElement(Node):
             class_dict[cl] = cl
 
         self.class_ = " ".join(class_dict.keys())
+        self._changed()
 
     def remove_class(self, *classes: str) -> None:
         """Remove classes to the 'class' attribute of the tag.
@@ -555,57 +672,74 @@ class HTMLElement(Node):
             self.class_ = " ".join(class_dict.keys())
         else:
             self.class_ = None
-
-    def _render_attr(self) -> str:
-        result = super(HTMLElement, self)._render_attr()
-
-        for name, value in self.data_attr.items():
-            result += self._render_single_attr(f"data-{name}", value)
-
-        for name, value in self.aria_attr.items():
-            result += self._render_single_attr(f"aria-{name}", value)
-
-        return result
-
-    def do_render(self, indent: str | None) -> str:
-        void_tags = [
-            "area",
-            "base",
-            "br",
-            "col",
-            "embed",
-            "hr",
-            "img",
-            "input",
-            "link",
-            "meta",
-            "source",
-            "track",
-            "wbr",
-        ]
-        raw_tags = ["script", "style"]
-
-        # filter None children
-        self.children = list(filter(_not_none, self.children))
-
-        if self.tag_name in void_tags and self.children != []:
-            raise ValueError("Void tags are not allowed to have content.")
-
-        if self.tag_name not in void_tags and self.children == []:
-            # none-void tags need a closing tag
-            self.children = [""]
-
-        if self.tag_name in raw_tags:
+        self._changed()
+
+    def _start_tag(
+        self, options: RenderOptions, indent: str | None, empty: bool
+    ) -> str:
+        if empty and options.minify:
+            # void tags without the xhtml slash
+            return f"<{self.tag_name}{self._render_attr(options)}>"
+        return super(HTMLElement, self)._start_tag(options, indent, empty)
+
+    def _render_single_attr(
+        self, name: str, value: str | bool, options: RenderOptions
+    ) -> str:
+        if options.minify and isinstance(value, str):
+            escaped = escape_attr(value)
+            if _UNQUOTED.fullmatch(escaped):
+                return f" {name}={escaped}"
+            return f' {name}="{escaped}"'
+        return super(HTMLElement, self)._render_single_attr(name, value, options)
+
+    def _keeps_whitespace(self) -> bool:
+        return self.tag_name in _KEEP_SPACE_TAGS
+
+    def _omit_end_tag(self, next_sibling: Element, parent: Node | None) -> bool:
+        after = _OPTIONAL_END_TAGS.get(self.tag_name)
+        if after is None:
+            return False
+        if next_sibling is None:
+            if parent is None:
+                # a rendered fragment, more content could follow
+                return self.tag_name == "html"
+            if self.tag_name == "p" and (
+                not isinstance(parent, HTMLElement)
+                or parent.tag_name in _P_KEEP_IN
+                or "-" in parent.tag_name
+            ):
+                return False
+            return None in after
+        if isinstance(next_sibling, Node):
+            return "*" in after or next_sibling.tag_name in after
+        # text or e.g. a comment
+        return False
+
+    def _content(self) -> Elements:
+        children = super(HTMLElement, self)._content()
+
+        if self.tag_name in _VOID_TAGS:
+            if children:
+                raise ValueError("Void tags are not allowed to have content.")
+            return children
+
+        if not children:
+            # none-void tags need a closing tag, raw ones without indent
+            return (NoEscape(""),) if self.tag_name in _RAW_TAGS else ("",)
+
+        if self.tag_name in _RAW_TAGS:
             # ensure all children are NoEscape
-            for idx, child in enumerate(self.children):
+            raw: list[NoEscape] = []
+            for child in children:
                 if isinstance(child, str):
-                    self.children[idx] = NoEscape(child)
+                    raw.append(NoEscape(child))
                 elif isinstance(child, NoEscape):
-                    ...
+                    raw.append(child)
                 else:
                     raise ValueError("Raw tags should only have str or NoEscape.")
+            return raw
 
-        return super(HTMLElement, self).do_render(indent)
+        return children
 
 
 _Method = Literal["post", "get", "dialog"]
@@ -623,7 +757,6 @@ _ReferrerPolicy = Literal[
 ]
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class a(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/a"""
 
@@ -637,37 +770,30 @@ class a(HTMLElement):
     type: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class abbr(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/abbr"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class acronym(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/acronym"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class address(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/address"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class area(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/area"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class article(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/article"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class aside(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/aside"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class audio(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/audio"""
 
@@ -682,12 +808,10 @@ class audio(HTMLElement):
     src: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class b(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/b"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class base(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/base"""
 
@@ -695,26 +819,22 @@ class base(HTMLElement):
     target: _Target | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class bdi(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/bdi"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class bdo(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/bdo"""
 
     dir_: Literal["ltr", "rtl", None] = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class blockquote(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/blockquote"""
 
     cite: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class body(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/body"""
 
@@ -738,12 +858,10 @@ class body(HTMLElement):
     onunload: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class br(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/br"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class button(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/button"""
 
@@ -762,7 +880,6 @@ class button(HTMLElement):
     value: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class canvas(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/canvas"""
 
@@ -770,100 +887,85 @@ class canvas(HTMLElement):
     width: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class caption(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/caption"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class cite(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/cite"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class code(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/code"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class col(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/col"""
 
     span: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class colgroup(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/colgroup"""
 
     span: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class data(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/data"""
 
     value: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class datalist(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/datalist"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class dd(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/dd"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class del_(HTMLElement):
-    """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/del_"""
+    """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/del"""
+
+    NAME: ClassVar[str | None] = "del"
 
     cite: str | None = None
     datetime: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class details(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/details"""
 
     open: bool = False
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class dfn(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/dfn"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class dialog(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/dialog"""
 
     open: bool = False
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class div(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/div"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class dl(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/dl"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class dt(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/dt"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class em(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/em"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class embed(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/embed"""
 
@@ -873,7 +975,6 @@ class embed(HTMLElement):
     width: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class fieldset(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/fieldset"""
 
@@ -882,22 +983,18 @@ class fieldset(HTMLElement):
     name: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class figcaption(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/figcaption"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class figure(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/figure"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class footer(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/footer"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class form(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/form"""
 
@@ -913,81 +1010,61 @@ class form(HTMLElement):
     target: _Target | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class h1(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/h1"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class h2(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/h2"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class h3(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/h3"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class h4(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/h4"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class h5(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/h5"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class h6(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/h6"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class head(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/head"""
 
     profile: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class header(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/header"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class hgroup(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/hgroup"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class hr(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/hr"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class html(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/html"""
 
     xmlns: str | None = None
 
-    def do_render(self, indent: str | None) -> str:
-        if DOMConfig.FULL_XHTML:
-            return (
-                '<?xml version="1.0" encoding="UTF-8" ?>\n'
-                '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.1//EN" '
-                '"http://www.w3.org/TR/xhtml11/DTD/xhtml11.dtd">\n'
-            ) + super(html, self).do_render(indent)
-        else:
-            return "<!DOCTYPE html>\n" + super(html, self).do_render(indent)
+    def _prologue(self, options: RenderOptions) -> str:
+        return options.doctype
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class i(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/i"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class iframe(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/iframe"""
 
@@ -1006,7 +1083,6 @@ class iframe(HTMLElement):
     width: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class img(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/img"""
 
@@ -1026,7 +1102,6 @@ class img(HTMLElement):
     usemap: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class input(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/input"""
 
@@ -1096,7 +1171,6 @@ class input(HTMLElement):
     width: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class ins(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/ins"""
 
@@ -1104,31 +1178,26 @@ class ins(HTMLElement):
     datetime: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class kbd(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/kbd"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class label(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/label"""
 
     for_: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class legend(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/legend"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class li(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/li"""
 
     value: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class link(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/link"""
 
@@ -1157,29 +1226,24 @@ class link(HTMLElement):
     blocking: bool = False
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class main(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/main"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class map(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/map"""
 
     name: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class mark(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/mark"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class menu(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/menu"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class meta(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/meta"""
 
@@ -1189,7 +1253,6 @@ class meta(HTMLElement):
     name: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class meter(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/meter"""
 
@@ -1202,17 +1265,14 @@ class meter(HTMLElement):
     form: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class nav(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/nav"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class noscript(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/noscript"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class object(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/object"""
 
@@ -1225,7 +1285,6 @@ class object(HTMLElement):
     width: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class ol(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/ol"""
 
@@ -1234,7 +1293,6 @@ class ol(HTMLElement):
     type: Literal["a", "A", "i", "I", "1"] | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class optgroup(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/optgroup"""
 
@@ -1242,7 +1300,6 @@ class optgroup(HTMLElement):
     label: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class option(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/option"""
 
@@ -1252,7 +1309,6 @@ class option(HTMLElement):
     value: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class output(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/output"""
 
@@ -1261,17 +1317,14 @@ class output(HTMLElement):
     name: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class p(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/p"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class picture(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/picture"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class portal(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/portal"""
 
@@ -1279,12 +1332,10 @@ class portal(HTMLElement):
     src: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class pre(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/pre"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class progress(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/progress"""
 
@@ -1292,39 +1343,32 @@ class progress(HTMLElement):
     value: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class q(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/q"""
 
     cite: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class rp(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/rp"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class rt(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/rt"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class ruby(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/ruby"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class s(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/s"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class samp(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/samp"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class script(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/script"""
 
@@ -1341,17 +1385,14 @@ class script(HTMLElement):
     blocking: bool = False
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class search(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/search"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class section(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/section"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class select(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/select"""
 
@@ -1365,19 +1406,16 @@ class select(HTMLElement):
     size: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class slot(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/slot"""
 
     name: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class small(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/small"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class source(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/source"""
 
@@ -1390,17 +1428,14 @@ class source(HTMLElement):
     width: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class span(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/span"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class strong(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/strong"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class style(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/style"""
 
@@ -1410,32 +1445,26 @@ class style(HTMLElement):
     blocking: bool = False
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class sub(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/sub"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class summary(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/summary"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class sup(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/sup"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class table(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/table"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class tbody(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/tbody"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class td(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/td"""
 
@@ -1444,12 +1473,10 @@ class td(HTMLElement):
     rowspan: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class template(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/template"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class textarea(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/textarea"""
 
@@ -1470,12 +1497,10 @@ class textarea(HTMLElement):
     wrap: Literal["hard", "soft", "off", None] = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class tfoot(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/tfoot"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class th(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/th"""
 
@@ -1486,29 +1511,24 @@ class th(HTMLElement):
     scope: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class thead(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/thead"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class time(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/time"""
 
     datetime: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class title(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/title"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class tr(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/tr"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class track(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/track"""
 
@@ -1521,22 +1541,18 @@ class track(HTMLElement):
     srclang: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class u(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/u"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class ul(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/ul"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class var(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/var"""
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class video(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/video"""
 
@@ -1556,6 +1572,284 @@ class video(HTMLElement):
     width: str | None = None
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class wbr(HTMLElement):
     """see https://developer.mozilla.org/en-US/docs/Web/HTML/Element/wbr"""
+
+
+class Column(NamedTuple):
+    """A column of a `DataTable`.
+
+    `header` is the content of the header cell or a `th`. The attributes
+    of `cell` (a `td` or `th` without children) are used for every cell
+    of the column. `format` turns a value into the content of its cell,
+    e.g. `lambda v: f"{v:.2f}"`.
+    """
+
+    header: Element = None
+    cell: td | th | None = None
+    format: Callable[[Any], Element] | None = None
+
+
+class DataTable(table):
+    """A table rendered from row data, without a node per cell.
+
+    Usage:
+        DataTable(
+            csv.reader(f),
+            ["Name", Column("Amount", td(class_="num"))],
+            row=tr(class_="row"),
+            class_="report",
+        )
+
+    Renders the same as the tree
+
+        table(**attrs)[
+            *children,  # e.g. a caption
+            thead[tr[th[column.header] for column in columns]],
+            tbody[
+                copy(row)[copy(column.cell)[value] for value in values]
+                for values in rows
+            ],
+        ]
+
+    The head is left out, if no column has a header. Values are the
+    content of the cells, None is an empty cell and others (e.g.
+    numbers) are converted by `str`. Each row needs a value per column.
+
+    The rows are read while rendering and never held in memory. Rows from
+    an iterator (e.g. a generator or a csv reader) can only be rendered
+    once, a second render raises ValueError. They are read into a tuple
+    once the table is copied, pickled (e.g. by `freeze`, `render` with
+    `workers` or `cached_component`), compared or fingerprinted.
+    """
+
+    NAME = "table"
+
+    # set by `__init__`
+    _rows: _Rows = field(init=False)
+    _columns: tuple[Column, ...] = field(init=False)
+    _row: tr | None = field(init=False)
+
+    def __init__(
+        self,
+        rows: Iterable[Sequence[Any]],
+        columns: Sequence[Column | str],
+        row: tr | None = None,
+        **attrs: Any,
+    ) -> None:
+        super(DataTable, self).__init__(**attrs)
+        if not columns:
+            raise ValueError("A DataTable needs at least one column.")
+        self._rows = _Rows(rows)
+        self._columns = tuple(
+            Column(column) if isinstance(column, str) else column for column in columns
+        )
+        self._row = row
+        templates = [column.cell for column in self._columns] + [row]
+        if any(template and _children(template) for template in templates):
+            raise ValueError("Row and cell templates cannot have children.")
+
+    @classmethod
+    def from_columns(
+        cls,
+        data: Mapping[str, Sequence[Any]],
+        columns: Sequence[Column | str] | None = None,
+        row: tr | None = None,
+        **attrs: Any,
+    ) -> DataTable:
+        """A table from the values per column, the keys are the headers."""
+        rows = zip(*data.values(), strict=True)
+        return cls(rows, list(data) if columns is None else columns, row, **attrs)
+
+    def _iter_parts(self, options: RenderOptions, depth: int) -> Iterator[str]:
+        return self._iter_table(options, depth, keep_space=False)
+
+    def _iter_minified_parts(
+        self,
+        options: RenderOptions,
+        keep_space: bool,
+        next_sibling: Element,
+        parent: Node | None,
+    ) -> Iterator[str]:
+        # the end tag of a table is always rendered
+        return self._iter_table(options, 0, keep_space)
+
+    def _iter_table(
+        self, options: RenderOptions, depth: int, keep_space: bool
+    ) -> Iterator[str]:
+        indent = options.indent_at(depth)
+        yield self._start_tag(options, indent, empty=False)
+        for child in _children(self):
+            yield from _child_parts(child, options, depth + 1, self, keep_space)
+
+        body = tbody()
+        if any(column.header is not None for column in self._columns):
+            head = thead()
+            head_row = tr()[
+                [
+                    column.header
+                    if isinstance(column.header, th)
+                    else th[column.header]
+                    for column in self._columns
+                ]
+            ]
+            yield head._start_tag(options, options.indent_at(depth + 1), empty=False)
+            yield from _child_parts(head_row, options, depth + 2, head, keep_space)
+            yield _end_tag(head, body, self, options, depth + 1)
+
+        yield body._start_tag(options, options.indent_at(depth + 1), empty=False)
+        yield from self._iter_rows(body, options, depth + 2, keep_space)
+        yield _end_tag(body, None, self, options, depth + 1)
+        yield self._end_tag(indent)
+
+    def _iter_rows(
+        self, body: tbody, options: RenderOptions, depth: int, keep_space: bool
+    ) -> Iterator[str]:
+        """The rows of the body, each rendered as one part."""
+        row = self._row or tr()
+        cells = [column.cell or td() for column in self._columns]
+        formats = [column.format for column in self._columns]
+        # the tags around the values are the same in every row
+        row_start = row._start_tag(options, options.indent_at(depth), empty=False)
+        row_end = _end_tag(row, row, body, options, depth)
+        last_row_end = _end_tag(row, None, body, options, depth)
+        starts = [
+            cell._start_tag(options, options.indent_at(depth + 1), empty=False)
+            for cell in cells
+        ]
+        ends = [
+            _end_tag(cell, next_cell, row, options, depth + 1)
+            for cell, next_cell in zip(cells, [*cells[1:], None], strict=True)
+        ]
+        text_indent = options.indent_at(depth + 2)
+        collapse = options.minify and not keep_space
+
+        rows = self._rows.read()
+        values = next(rows, None)
+        if values is None:
+            # an empty body, like `tbody()`
+            yield _render_text("", options.indent_at(depth))
+            return
+
+        while values is not None:
+            following = next(rows, None)
+            if len(values) != len(cells):
+                raise ValueError(
+                    f"A row has {len(values)} values for {len(cells)} columns."
+                )
+            parts = [row_start]
+            for value, start, end, cell, format_ in zip(
+                values, starts, ends, cells, formats, strict=True
+            ):
+                content = value if format_ is None else format_(value)
+                parts.append(start)
+                if isinstance(content, str):
+                    parts.append(_cell_text(content, text_indent, collapse))
+                else:
+                    parts.extend(
+                        _cell_parts(content, options, depth + 2, cell, keep_space)
+                    )
+                parts.append(end)
+            parts.append(row_end if following is not None else last_row_end)
+            yield "".join(parts)
+            values = following
+
+
+def _cell_text(text: str, indent: str | None, collapse: bool) -> str:
+    text = escape_text(text)
+    if collapse:
+        return _WHITESPACE.sub(" ", text)
+    if indent is not None:
+        return f"{indent}{text}\n"
+    return text
+
+
+def _cell_parts(
+    content: Any, options: RenderOptions, depth: int, cell: Node, keep_space: bool
+) -> Iterator[str]:
+    if content is None:
+        content = ""
+    elif isinstance(content, Node) or hasattr(content, "do_render"):
+        yield from _child_parts(content, options, depth, cell, keep_space)
+        return
+    # e.g. numbers
+    collapse = options.minify and not keep_space
+    yield _cell_text(str(content), options.indent_at(depth), collapse)
+
+
+class _Rows:
+    """The rows of a `DataTable`, an iterator is read only once."""
+
+    def __init__(self, rows: Iterable[Sequence[Any]]) -> None:
+        self._rows = rows
+        self._read = False
+
+    def read(self) -> Iterator[Sequence[Any]]:
+        if iter(self._rows) is self._rows:
+            if self._read:
+                raise ValueError(
+                    "The rows of this DataTable are an iterator, that was already "
+                    "rendered. Pass a list or freeze the table to render it again."
+                )
+            self._read = True
+        return iter(self._rows)
+
+    def values(self) -> tuple[Sequence[Any], ...]:
+        """All rows, an iterator is replaced by them."""
+        if isinstance(self._rows, tuple):
+            return self._rows
+        rows = tuple(self.read())
+        if iter(self._rows) is self._rows:
+            self._rows = rows
+            self._read = False
+        return rows
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, _Rows):
+            return NotImplemented
+        return self.values() == other.values()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        # e.g. for `Node.fingerprint`
+        return repr(self.values())
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (_Rows, (self.values(),))
+
+
+def _end_tag(
+    node: Node,
+    next_sibling: Element,
+    parent: Node,
+    options: RenderOptions,
+    depth: int,
+) -> str:
+    """The end tag of `node`, if not left out on minify."""
+    if options.minify and node._omit_end_tag(next_sibling, parent):
+        return ""
+    return node._end_tag(options.indent_at(depth))
+
+
+def _child_parts(
+    child: Element,
+    options: RenderOptions,
+    depth: int,
+    parent: Node,
+    keep_space: bool,
+) -> Iterator[str]:
+    """Render `child` of `parent` like the tree walk, as its last child."""
+    if isinstance(child, str):
+        if options.minify:
+            text = escape_text(child)
+            yield text if keep_space else _WHITESPACE.sub(" ", text)
+        else:
+            yield _render_text(child, options.indent_at(depth))
+    elif isinstance(child, Node):
+        if options.minify:
+            yield from child._iter_minified_parts(options, keep_space, None, parent)
+        else:
+            yield from child._iter_parts(options, depth)
+    elif child is not None:
+        yield _render_other(child, options.indent_at(depth))
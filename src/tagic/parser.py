@@ -0,0 +1,206 @@
+"""Parse html into tagic nodes.
+
+Usage:
+    nodes = parse("<ul><li>one<li>two</ul>")
+    with open("page.html") as f:
+        page, = parse(f)
+
+Tags become the element classes of `tagic.html`, unknown tags (e.g.
+custom elements or svg) `XML` nodes. Empty XML nodes get an empty text,
+so they keep their end tag. Built on `html.parser`, which does
+not correct broken html like a browser: only end tags, that are
+optional by the html spec, are closed implicitly.
+"""
+
+from html.parser import HTMLParser
+from typing import Any, Protocol
+
+from . import html
+from .base import Element, Node, NoEscape, _attr_fields, _dict_field
+from .xml import XML
+
+
+class SupportsRead(Protocol):
+    def read(self, size: int, /) -> str:  # pragma: no cover
+        ...
+
+
+def parse(source: str | SupportsRead, chunk_size: int = 64 * 1024) -> list[Element]:
+    """Parse html from a str or a text stream into nodes.
+
+    A stream is read and parsed in chunks of `chunk_size` characters.
+    Returns the top level nodes and texts, without whitespace between
+    them. Comments are kept as `NoEscape`, the doctype is left out
+    (`html` renders its own).
+    """
+    builder = _TreeBuilder()
+    if isinstance(source, str):
+        builder.feed(source)
+    else:
+        while chunk := source.read(chunk_size):
+            builder.feed(chunk)
+    builder.close()
+    return builder.result
+
+
+# elements, that stop the search for an implied end tag, see
+# https://html.spec.whatwg.org/multipage/parsing.html#has-an-element-in-scope
+_SCOPE = frozenset(
+    ("applet", "caption", "html", "table", "td", "th", "marquee", "object", "template")
+)
+_TABLE_SCOPE = frozenset(("html", "table", "template"))
+_TABLE_PARTS = frozenset(("thead", "tbody", "tfoot", "caption", "colgroup"))
+# start tag -> (the open elements it closes, the elements that stop the
+# search), the elements nested in a closed one are closed as well, and
+# directly enclosing ones from the first set (e.g. optgroup by optgroup)
+_IMPLIED_END_TAGS: dict[str, tuple[frozenset[str], frozenset[str]]] = {
+    **{tag: (frozenset(("p",)), _SCOPE | {"button"}) for tag in html._P_CLOSERS},
+    "li": (frozenset(("li",)), _SCOPE | {"ul", "ol", "menu"}),
+    "dt": (frozenset(("dt", "dd")), _SCOPE | {"dl"}),
+    "dd": (frozenset(("dt", "dd")), _SCOPE | {"dl"}),
+    "rt": (frozenset(("rt", "rp")), _SCOPE | {"ruby"}),
+    "rp": (frozenset(("rt", "rp")), _SCOPE | {"ruby"}),
+    "option": (frozenset(("option",)), _SCOPE | {"select", "datalist", "optgroup"}),
+    "optgroup": (frozenset(("option", "optgroup")), _SCOPE | {"select", "datalist"}),
+    "hr": (frozenset(("p", "option", "optgroup")), _SCOPE | {"button", "select"}),
+    "thead": (_TABLE_PARTS, _TABLE_SCOPE),
+    "tbody": (_TABLE_PARTS, _TABLE_SCOPE),
+    "tfoot": (_TABLE_PARTS, _TABLE_SCOPE),
+    "colgroup": (frozenset(("caption", "colgroup")), _TABLE_SCOPE),
+    "tr": (frozenset(("tr", "caption", "colgroup")), _TABLE_SCOPE | _TABLE_PARTS),
+    "td": (frozenset(("td", "th")), _TABLE_SCOPE | {"tr"}),
+    "th": (frozenset(("td", "th")), _TABLE_SCOPE | {"tr"}),
+}
+# the content of head, others close it
+_HEAD_TAGS = frozenset(
+    ("base", "link", "meta", "noscript", "script", "style", "template", "title")
+)
+
+# tag name -> element class, created on first use
+_ELEMENTS: dict[str, type[html.HTMLElement]] = {}
+
+
+def _element_class(tag: str) -> type[html.HTMLElement] | None:
+    if not _ELEMENTS:
+        for name, value in vars(html).items():
+            if (
+                isinstance(value, type)
+                and issubclass(value, html.HTMLElement)
+                and value is not html.HTMLElement
+                # not e.g. `DataTable`, that renders a table
+                and value.NAME in {None, name.rstrip("_")}
+            ):
+                _ELEMENTS[name.rstrip("_")] = value
+    return _ELEMENTS.get(tag)
+
+
+def _create(tag: str, attrs: list[tuple[str, str | None]]) -> Node:
+    cls = _element_class(tag)
+    if cls is None:
+        return XML(
+            tag, attrs={name: True if value is None else value for name, value in attrs}
+        )
+
+    attr_fields = _attr_fields(cls)
+    kwargs: dict[str, Any] = {}
+    for name, value in attrs:
+        field_name = attr_fields.get(name)
+        if field_name is not None:
+            default = cls._FIELDS[field_name].default
+            # boolean attributes, e.g. `disabled` or `disabled=""`
+            if value is None or (value == "" and default is False):
+                kwargs[field_name] = True
+            else:
+                kwargs[field_name] = value
+            continue
+
+        dict_field, prefix = _dict_field(cls, name)
+        attrs_dict = kwargs.setdefault(dict_field, {})
+        attrs_dict[name[len(prefix) :]] = True if value is None else value
+    return cls(**kwargs)
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self) -> None:
+        super(_TreeBuilder, self).__init__(convert_charrefs=True)
+        self.result: list[Element] = []
+        # the open elements and their children
+        self._stack: list[tuple[Node, list[Element]]] = []
+
+    def _append(self, element: Element) -> None:
+        children = self._stack[-1][1] if self._stack else self.result
+        if isinstance(element, str) and children and isinstance(children[-1], str):
+            # text can be split in several parts, e.g. by the chunks
+            children[-1] += element
+        else:
+            children.append(element)
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._close_optional(tag)
+        node = _create(tag, attrs)
+        self._append(node)
+        if tag not in html._VOID_TAGS:
+            children: list[Element] = []
+            node.children = children
+            self._stack.append((node, children))
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._close_optional(tag)
+        node = _create(tag, attrs)
+        if isinstance(node, XML):
+            # rendered with an end tag, see `_close`
+            node.children = [""]
+        self._append(node)
+
+    def handle_endtag(self, tag: str) -> None:
+        for pos in range(len(self._stack) - 1, -1, -1):
+            if self._stack[pos][0].tag_name == tag:
+                # closes the elements left open inside as well
+                self._close(pos)
+                return
+        # an end tag without start tag is ignored
+
+    def close(self) -> None:
+        super(_TreeBuilder, self).close()
+        self._close(0)
+
+    def handle_data(self, data: str) -> None:
+        if self._stack or data.strip():
+            self._append(data)
+
+    def handle_comment(self, data: str) -> None:
+        self._append(NoEscape(f"<!--{data}-->"))
+
+    def handle_pi(self, data: str) -> None:
+        self._append(NoEscape(f"<?{data}>"))
+
+    def _close_optional(self, tag: str) -> None:
+        """Close the open elements, whose end tag is implied by `tag`."""
+        rule = _IMPLIED_END_TAGS.get(tag)
+        if rule is not None:
+            closed, stops = rule
+            for pos in range(len(self._stack) - 1, -1, -1):
+                name = self._stack[pos][0].tag_name
+                if name in closed:
+                    start = pos
+                    while start and self._stack[start - 1][0].tag_name in closed:
+                        start -= 1
+                    self._close(start)
+                    break
+                if name in stops:
+                    break
+        if (
+            self._stack
+            and self._stack[-1][0].tag_name == "head"
+            and tag not in _HEAD_TAGS
+        ):
+            self._close(len(self._stack) - 1)
+
+    def _close(self, pos: int) -> None:
+        """Close the open elements from `pos` on."""
+        for node, children in self._stack[pos:]:
+            if not children and isinstance(node, XML):
+                # an empty XML node renders as `<my-el />`, that is an
+                # unclosed start tag in html
+                children.append("")
+        del self._stack[pos:]
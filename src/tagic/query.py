@@ -0,0 +1,259 @@
+"""Find nodes in a tree, see `Node.find_by_id`, `find_all` and `select`.
+
+Usage:
+    form = page.find_by_id("signup")
+    buttons = page.find_all("button", class_="primary")
+    links = page.select("nav > ul a[href]")
+
+The queries are answered from an index of the tree, that is built on the
+first query and kept on the queried node. It is dropped, once a node of
+the tree is changed by `[]`, `add_class` or `remove_class`.
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+from .base import (
+    Frozen,
+    Node,
+    NoEscape,
+    _attr_fields,
+    _children,
+    _dict_field,
+    _mark,
+    _Stamp,
+)
+
+
+class TreeIndex:
+    """The nodes below a root by id, tag and class, in document order.
+
+    Frozen nodes are immutable copies and not searched.
+    """
+
+    def __init__(self, root: Node) -> None:
+        self._stamp = _Stamp()
+        self.nodes: list[Node] = []
+        # id of a node -> its parent, up to the root
+        self.parents: dict[int, Node] = {}
+        self.by_id: dict[str, list[Node]] = {}
+        self.by_tag: dict[str, list[Node]] = {}
+        self.by_class: dict[str, list[Node]] = {}
+
+        _mark(root, self._stamp)
+        stack = [(child, root) for child in reversed(_searched(root))]
+        while stack:
+            node, parent = stack.pop()
+            _mark(node, self._stamp)
+            self.nodes.append(node)
+            self.parents[id(node)] = parent
+            _add(self.by_tag, node.tag_name, node)
+            if node_id := _attr_value(node, "id"):
+                _add(self.by_id, node_id, node)
+            for class_ in _classes(node):
+                _add(self.by_class, class_, node)
+            if "children" in node.__dict__:
+                stack.extend((child, node) for child in reversed(_searched(node)))
+
+    @property
+    def valid(self) -> bool:
+        return self._stamp.valid
+
+    def find_by_id(self, node_id: str) -> Node | None:
+        found = self.by_id.get(node_id)
+        return found[0] if found else None
+
+    def find_all(self, tag: str | None = None, class_: str | None = None) -> list[Node]:
+        if class_ is None:
+            return list(self.nodes if tag is None else self.by_tag.get(tag, ()))
+        found = self.by_class.get(class_, [])
+        if tag is None:
+            return list(found)
+        return [node for node in found if node.tag_name == tag]
+
+    def select(self, selector: str) -> list[Node]:
+        groups = _parse_selector(selector)
+        found: dict[int, Node] = {}
+        for parts in groups:
+            for node in self._candidates(parts[-1][1]):
+                if id(node) not in found and self._matches(node, parts, len(parts) - 1):
+                    found[id(node)] = node
+        if len(groups) == 1:
+            return list(found.values())
+        return [node for node in self.nodes if id(node) in found]
+
+    def _candidates(self, compound: "_Compound") -> list[Node]:
+        if compound.ids:
+            return self.by_id.get(compound.ids[0], [])
+        if compound.classes:
+            return self.by_class.get(compound.classes[0], [])
+        if compound.tag is not None:
+            return self.by_tag.get(compound.tag, [])
+        return self.nodes
+
+    def _matches(self, node: Node, parts: "_Selector", pos: int) -> bool:
+        """Whether `node` matches the selector up to `pos`, right to left."""
+        combinator, compound = parts[pos]
+        if not _matches_compound(node, compound):
+            return False
+        if pos == 0:
+            return True
+        parent = self.parents.get(id(node))
+        if combinator == ">":
+            return parent is not None and self._matches(parent, parts, pos - 1)
+        while parent is not None:
+            if self._matches(parent, parts, pos - 1):
+                return True
+            parent = self.parents.get(id(parent))
+        return False
+
+
+def _add(nodes: dict[str, list[Node]], key: str, node: Node) -> None:
+    found = nodes.get(key)
+    if found is None:
+        nodes[key] = [node]
+    else:
+        found.append(node)
+
+
+def _searched(node: Node) -> list[Node]:
+    return [
+        child
+        for child in _children(node)
+        if isinstance(child, Node) and not isinstance(child, Frozen)
+    ]
+
+
+def _attr_value(node: Node, name: str) -> str | None:
+    """The value of the attribute `name` as rendered, None if not rendered.
+
+    Boolean attributes have the value "".
+    """
+    cls = type(node)
+    field_name = _attr_fields(cls).get(name)
+    if field_name is not None:
+        return _text(getattr(node, field_name))
+
+    dict_field, prefix = _dict_field(cls, name)
+    for field_name, key in ((dict_field, name[len(prefix) :]), ("attr", name)):
+        attrs = node.__dict__.get(field_name)
+        if attrs and key in attrs:
+            return _text(attrs[key])
+    return None
+
+
+def _text(value: object) -> str | None:
+    if isinstance(value, str):
+        return value
+    if value is None or value is False:
+        return None
+    if value is True:
+        return ""
+    if isinstance(value, NoEscape):
+        return value.content
+    return str(value)
+
+
+def _classes(node: Node) -> list[str]:
+    value = _attr_value(node, "class")
+    return value.split() if value else []
+
+
+class _Compound(NamedTuple):
+    """A compound selector, e.g. `a.nav[href]`."""
+
+    tag: str | None
+    ids: tuple[str, ...]
+    classes: tuple[str, ...]
+    # name and value, None to only require the attribute
+    attrs: tuple[tuple[str, str | None], ...]
+
+
+# (combinator to the left: "", " " or ">", compound)
+_Selector = tuple[tuple[str, _Compound], ...]
+
+_TAG = re.compile(r"\*|[\w-]+")
+_SIMPLE = re.compile(
+    r"""
+    \#(?P<id>[\w-]+)
+    | \.(?P<cls>[\w-]+)
+    | \[\s*(?P<attr>[\w:.@-]+)\s*
+        (?:=\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[\w-]+))\s*)?
+      \]
+    """,
+    re.VERBOSE,
+)
+_COMBINATOR = re.compile(r"\s*>\s*|\s+")
+_GROUP = re.compile(r"\s*,\s*")
+
+
+def _matches_compound(node: Node, compound: _Compound) -> bool:
+    if compound.tag is not None and node.tag_name != compound.tag:
+        return False
+    if compound.ids and any(_attr_value(node, "id") != id_ for id_ in compound.ids):
+        return False
+    if compound.classes:
+        classes = _classes(node)
+        if any(class_ not in classes for class_ in compound.classes):
+            return False
+    for name, expected in compound.attrs:
+        value = _attr_value(node, name)
+        if value is None or (expected is not None and value != expected):
+            return False
+    return True
+
+
+@lru_cache(maxsize=256)
+def _parse_selector(selector: str) -> tuple[_Selector, ...]:
+    """Parse a group of selectors, e.g. `ul > li.active a[href], #nav`.
+
+    Supported are type, universal, id, class and attribute (`[name]`,
+    `[name=value]`) selectors, combined by descendant and child
+    combinators. Raises ValueError for anything else.
+    """
+    text = selector.strip()
+    groups: list[_Selector] = []
+    parts: list[tuple[str, _Compound]] = []
+    combinator = ""
+    pos = 0
+    while True:
+        compound, pos = _parse_compound(selector, text, pos)
+        parts.append((combinator, compound))
+        if pos == len(text):
+            groups.append(tuple(parts))
+            return tuple(groups)
+
+        if match := _GROUP.match(text, pos):
+            groups.append(tuple(parts))
+            parts, combinator = [], ""
+        elif match := _COMBINATOR.match(text, pos):
+            combinator = ">" if ">" in match.group() else " "
+        else:
+            raise ValueError(f"Invalid selector: {selector!r}")
+        pos = match.end()
+
+
+def _parse_compound(selector: str, text: str, pos: int) -> tuple[_Compound, int]:
+    tag = None
+    if match := _TAG.match(text, pos):
+        tag = None if match.group() == "*" else match.group()
+        pos = match.end()
+    elif not _SIMPLE.match(text, pos):
+        raise ValueError(f"Invalid selector: {selector!r}")
+
+    ids: list[str] = []
+    classes: list[str] = []
+    attrs: list[tuple[str, str | None]] = []
+    while match := _SIMPLE.match(text, pos):
+        if match["id"]:
+            ids.append(match["id"])
+        elif match["cls"]:
+            classes.append(match["cls"])
+        else:
+            value = match["dq"]
+            if value is None:
+                value = match["sq"] if match["sq"] is not None else match["bare"]
+            attrs.append((match["attr"], value))
+        pos = match.end()
+    return _Compound(tag, tuple(ids), tuple(classes), tuple(attrs)), pos
@@ -0,0 +1,178 @@
+import re
+from typing import Any, Sequence
+
+from .base import Node, NoEscape, _render_text, escape_attr
+
+# Slots render to markers, that are cut out again on compilation.
+_MARKER = re.compile("\x00([^\x00]*)\x00")
+# places in the rendered html, see `_scan`
+_TEXT, _TAG, _QUOTED, _RAW = range(4)
+# elements with raw text content
+_RAW_TAGS = frozenset(("script", "style"))
+# what ends a place, raw text by the end tag of its element
+_PLACE_ENDS = {
+    _TEXT: re.compile(r"<(/?)([\w:-]*)"),
+    _TAG: re.compile('[">]'),
+    _QUOTED: re.compile('"'),
+}
+_RAW_ENDS = {tag: re.compile(f"</{tag}") for tag in _RAW_TAGS}
+
+
+class Slot(str):
+    """Placeholder for a child or an attribute value of a `Template`.
+
+    Usage:
+        Template(div(id=Slot("id"))[Slot("content")])
+    """
+
+    name: str
+
+    def __new__(cls, name: str) -> "Slot":
+        assert "\x00" not in name, f"{name=} cannot contain NUL."
+        slot = super(Slot, cls).__new__(cls, f"\x00{name}\x00")
+        slot.name = name
+        return slot
+
+    def __repr__(self) -> str:
+        return f"Slot({self.name!r})"
+
+
+class Template:
+    """A node compiled into prerendered text with holes for its `Slot`s.
+
+    All the static structure is rendered once on creation, `render`
+    only renders the values of the slots and joins the parts.
+    """
+
+    def __init__(self, node: Node, indent: bool = False) -> None:
+        self.indent = indent
+        parts = _MARKER.split(node.render(indent=indent))
+        self._literals: list[str] = parts[::2]
+        self._holes: list[tuple[str, str, str | None]] = []
+
+        place = (_TEXT, "")
+        # whether the current literal starts at the start of a line
+        at_line_start = True
+        for pos, name in enumerate(parts[1::2]):
+            before, after = self._literals[pos], self._literals[pos + 1]
+            place = _scan(before, place)
+            at_line_start = at_line_start or "\n" in before
+            if place[0] == _QUOTED:
+                # in an attribute value, maybe with other text
+                self._holes.append(("a", name, None))
+            elif place[0] == _RAW:
+                # the content of script or style, neither escaped nor
+                # indented
+                self._holes.append(("r", name, None))
+            elif place[0] == _TAG:
+                raise ValueError(
+                    f"Slot {name!r} is neither a child nor an attribute value."
+                )
+            else:
+                line_start = before.rfind("\n") + 1
+                hole_indent = before[line_start:]
+                if (
+                    indent
+                    and at_line_start
+                    and not hole_indent.strip(" ")
+                    and after.startswith("\n")
+                ):
+                    # the slot is a whole indented text `{indent}{text}\n`,
+                    # the value is rendered at the same place instead
+                    self._literals[pos] = before[:line_start]
+                    self._literals[pos + 1] = after[1:]
+                    self._holes.append(("t", name, hole_indent))
+                    continue
+                # within other text, the value is rendered inline
+                self._holes.append(("t", name, None))
+            at_line_start = False
+
+        self.names = frozenset(name for _, name, _ in self._holes)
+
+    def render(self, **values: Any) -> str:
+        """Render the template with the values for the slots.
+
+        Text slots accept the same as children: str (will be escaped),
+        None, nodes or a sequence of them, they are rendered without
+        indent within other text. Attribute slots are converted to str
+        and escaped. Slots in script and style accept str, NoEscape
+        or a sequence of them and insert them as is.
+        """
+        if missing := self.names - values.keys():
+            raise TypeError(f"Missing values for slots: {sorted(missing)}")
+        if unknown := values.keys() - self.names:
+            raise TypeError(f"Unknown slots: {sorted(unknown)}")
+
+        result = [self._literals[0]]
+        for (kind, name, indent), literal in zip(
+            self._holes, self._literals[1:], strict=True
+        ):
+            value = values[name]
+            if kind == "a":
+                result.append(escape_attr(str(value)))
+            elif kind == "r":
+                _render_raw(result, value)
+            else:
+                _render_value(result, value, indent)
+            result.append(literal)
+        return "".join(result)
+
+
+def _render_value(result: list[str], value: Any, indent: str | None) -> None:
+    if value is None:
+        return
+    elif isinstance(value, str):
+        result.append(_render_text(value, indent))
+    elif isinstance(value, Sequence):
+        for item in value:
+            _render_value(result, item, indent)
+    else:
+        result.append(value.do_render(indent))
+
+
+def _render_raw(result: list[str], value: Any) -> None:
+    if value is None:
+        return
+    elif isinstance(value, str):
+        result.append(value)
+    elif isinstance(value, NoEscape):
+        result.append(value.content)
+    elif isinstance(value, Sequence):
+        for item in value:
+            _render_raw(result, item)
+    else:
+        raise ValueError("Raw tags should only have str or NoEscape.")
+
+
+def _scan(text: str, place: tuple[int, str]) -> tuple[int, str]:
+    """The place after `text` in rendered html, given the one before.
+
+    A place is the kind (`_TEXT`, `_TAG`, `_QUOTED` or `_RAW`) and the
+    open raw text tag or "". Text and attribute values are escaped,
+    hence outside of raw text `<` only starts tags and `"` only delimits
+    attribute values.
+    """
+    kind, raw = place
+    pos = 0
+    while match := _place_end(kind, raw).search(text, pos):
+        pos = match.end()
+        if kind == _TEXT:
+            closing, tag = match.groups()
+            if not closing and tag in _RAW_TAGS:
+                raw = tag
+            kind = _TAG
+        elif kind == _TAG:
+            if match.group() == '"':
+                kind = _QUOTED
+            else:
+                kind = _RAW if raw else _TEXT
+        elif kind == _QUOTED:
+            kind = _TAG
+        else:
+            # continue with the end tag as text
+            kind, raw, pos = _TEXT, "", match.start()
+    return kind, raw
+
+
+def _place_end(kind: int, raw: str) -> re.Pattern[str]:
+    return _RAW_ENDS[raw] if kind == _RAW else _PLACE_ENDS[kind]
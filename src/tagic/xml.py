@@ -1,12 +1,12 @@
-from dataclasses import dataclass
+from dataclasses import field
 
-from .base import Elements, Node
+from .base import Elements, Node, RenderOptions
 
 
-@dataclass(kw_only=True, slots=True, repr=False)
 class XML(Node):
-    _name: str | None
-    _is_root: bool
+    # set by `__init__`
+    _name: str | None = field(init=False)
+    _is_root: bool = field(init=False)
 
     def __init__(
         self,
@@ -28,8 +28,7 @@ class XML(Node):
     def tag_name(self) -> str:
         return self._name or super(XML, self).tag_name
 
-    def do_render(self, indent: str | None) -> str:
-        render = ""
+    def _prologue(self, options: RenderOptions) -> str:
         if self._is_root:
-            render = "<?xml version='1.0' encoding='UTF-8' ?>\n"
-        return render + super(XML, self).do_render(indent)
+            return f"<?xml version='1.0' encoding='{options.encoding}' ?>\n"
+        return ""
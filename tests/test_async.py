@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import pytest
+
+from tagic.base import RenderOptions
+from tagic.html import body, div, li, main, nav, p, script, span, ul
+
+
+async def _delayed(value, delay=0.05):
+    await asyncio.sleep(delay)
+    return value
+
+
+def test_arender():
+    async def run():
+        tree = body[
+            nav[_delayed(ul[li["a"], li["b"]])],
+            main[p["x"], _delayed("y & z"), _delayed(None)],
+        ]
+        return await tree.arender(), await body[_delayed([span["s"], "t"])].arender(
+            indent=True
+        )
+
+    compact, indented = asyncio.run(run())
+    assert compact == (
+        "<body><nav><ul><li>a</li><li>b</li></ul></nav>"
+        "<main><p>x</p>y &amp; z</main></body>"
+    )
+    assert indented == body[span["s"], "t"].render(indent=True)
+
+
+def test_arender_runs_concurrently():
+    async def run():
+        tree = div[[_delayed(p[str(i)], 0.1) for i in range(10)]]
+        start = time.perf_counter()
+        result = await tree.arender()
+        return result, time.perf_counter() - start
+
+    result, duration = asyncio.run(run())
+    assert result == div[[p[str(i)] for i in range(10)]].render()
+    assert duration < 0.5  # noqa: PLR2004
+
+
+def test_aiter_render_in_order():
+    async def run():
+        tree = div[
+            p["first"],
+            _delayed(p["slow"], 0.1),
+            _delayed(p[_delayed("nested")], 0.01),
+        ]
+        return [chunk async for chunk in tree.aiter_render(chunk_size=1)]
+
+    chunks = asyncio.run(run())
+    assert chunks[:3] == ["<div>", "<p>", "first"]
+    assert "".join(chunks) == ("<div><p>first</p><p>slow</p><p>nested</p></div>")
+
+
+def test_awaitables_need_async_render():
+    coro = _delayed("x")
+    with pytest.raises(TypeError):
+        div[coro].render()
+    coro.close()
+
+    with pytest.raises(ValueError):
+        asyncio.run(script[_delayed("x")].arender())
+    with pytest.raises(ValueError, match="Minified"):
+        asyncio.run(div["x"].arender(options=RenderOptions(minify=True)))
@@ -0,0 +1,45 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from tagic.batch import build
+from tagic.html import body, h1, p
+
+
+def _about():
+    return body[h1["About"], p["Tom & Jerry"]]
+
+
+def test_build(tmp_path):
+    index = body[h1["Index"]]
+    pages = [
+        (tmp_path / "index.html", index),
+        (tmp_path / "sub" / "about.html", _about),
+    ]
+
+    report = build(pages)
+    assert [page.written for page in report.pages] == [True, True]
+    assert (tmp_path / "index.html").read_text() == index.render()
+    assert (tmp_path / "sub" / "about.html").read_text() == _about().render()
+    assert "2 pages (2 written, 0 unchanged)" in report.summary()
+
+    os.utime(tmp_path / "index.html", (0, 0))
+    report = build(pages, workers=2)
+    assert report.written == []
+    assert (tmp_path / "index.html").stat().st_mtime == 0
+
+    pages[0] = (tmp_path / "index.html", body[h1["New"]])
+    with ThreadPoolExecutor(2) as executor:
+        report = build(pages, indent=True, workers=executor)
+    assert [page.path.name for page in report.written] == ["index.html", "about.html"]
+    assert (tmp_path / "index.html").read_text() == body[h1["New"]].render(indent=True)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["index.html", "sub"]
+
+
+def test_build_deep_tree(tmp_path):
+    page = p["leaf"]
+    for _ in range(sys.getrecursionlimit() * 2):
+        page = body[page]
+    report = build([(tmp_path / "deep.html", page)], workers=2)
+    assert len(report.written) == 1
+    assert (tmp_path / "deep.html").read_text() == page.render()
@@ -0,0 +1,39 @@
+import json
+
+from tagic import bench
+
+
+def test_bench(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    assert (
+        bench.main(["--scale", "0.001", "--repeat", "1", "--output", str(output)]) == 0
+    )
+    results = json.loads(output.read_text())["results"]
+    assert set(results) == set(bench.CASES)
+    assert all(r["min"] > 0 for r in results.values())
+    # runs in a subprocess
+    assert results.pop("import_html")["peak_memory"] is None
+    assert all(r["peak_memory"] > 0 for r in results.values())
+
+
+def test_bench_baseline(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+
+    def run(min_time):
+        result = {"min": min_time, "median": min_time, "peak_memory": 0}
+        baseline.write_text(
+            json.dumps({"scale": 0.001, "results": {"render_page": result}})
+        )
+        args = ["render_page", "render_deep", "--scale", "0.001", "--repeat", "1"]
+        status = bench.main([*args, "--baseline", str(baseline)])
+        return status, capsys.readouterr().out.splitlines()
+
+    status, lines = run(1e-9)
+    assert status == 1
+    assert lines[1].startswith("render_page") and lines[1].endswith(" slower")
+    # no baseline for the case
+    assert lines[2].startswith("render_deep") and lines[2].endswith(" -")
+
+    status, lines = run(1e3)
+    assert status == 0
+    assert not lines[1].endswith(" slower")
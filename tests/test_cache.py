@@ -0,0 +1,91 @@
+import sys
+import threading
+
+import pytest
+
+import tagic
+from tagic.base import Frozen
+from tagic.html import div, span
+
+calls = []
+
+
+@tagic.cached_component(maxsize=2)
+def badge(user_id, label="user"):
+    calls.append(user_id)
+    return span(class_="badge")[f"{label} {user_id}"]
+
+
+def test_cached_component():
+    badge.cache_clear()
+    calls.clear()
+
+    first = badge(1)
+    assert isinstance(first, Frozen)
+    assert badge(1) is first
+    assert badge(1, label="user") is not first
+    assert div[first, badge(2)].render() == (
+        '<div><span class="badge">user 1</span><span class="badge">user 2</span></div>'
+    )
+    assert badge.cache_info() == (1, 3, 2, 2)
+    assert badge.__name__ == "badge"
+
+    # 1 was the least recently used
+    badge(3)
+    assert badge(1) is not first
+    assert calls == [1, 1, 2, 3, 1]
+
+    badge.cache_clear()
+    assert badge.cache_info() == (0, 0, 2, 0)
+
+
+def test_cached_component_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("tagic.cache.time.monotonic", lambda: now[0])
+
+    @tagic.cached_component(ttl=10)
+    def item(name):
+        return span[name]
+
+    node = item("a")
+    now[0] += 9
+    assert item("a") is node
+    now[0] += 2
+    assert item("a") is not node
+    assert item.cache_info().misses == 2  # noqa: PLR2004
+
+
+def test_cached_component_threads():
+    @tagic.cached_component(maxsize=8)
+    def item(i):
+        return span[str(i)]
+
+    def run():
+        for i in range(100):
+            assert item(i % 10).render() == f"<span>{i % 10}</span>"
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    info = item.cache_info()
+    assert info.hits + info.misses == 400  # noqa: PLR2004
+    assert info.currsize == 8  # noqa: PLR2004
+
+
+def test_cached_component_maxsize():
+    with pytest.raises(ValueError):
+        tagic.cached_component(maxsize=0)
+
+
+def test_cached_component_deep_tree():
+    @tagic.cached_component()
+    def deep(depth):
+        node = span["leaf"]
+        for _ in range(depth):
+            node = div[node]
+        return node
+
+    depth = sys.getrecursionlimit() * 2
+    assert deep(depth).render() == deep.__wrapped__(depth).render()
@@ -0,0 +1,51 @@
+import pytest
+
+import tagic
+from tagic.html import div, li, p, span, ul
+
+
+def _panel(count, name="Tom", items=("a", "b")):
+    return div(id="panel")[
+        p(id="count")[f"Count: {count}"],
+        div(class_="box")[span(id="name")[name], "static"],
+        ul(id="items")[[li[item] for item in items]],
+    ]
+
+
+def test_diff():
+    old = _panel(1)
+    assert tagic.diff(old, _panel(1)) == []
+    assert tagic.diff(old, _panel(2)) == [
+        '<p id="count" hx-swap-oob="true">Count: 2</p>'
+    ]
+    # nested in an element without id and several changes
+    assert tagic.diff(old, _panel(2, name="Jerry", items=("a", "c"))) == [
+        '<p id="count" hx-swap-oob="true">Count: 2</p>',
+        '<span id="name" hx-swap-oob="true">Jerry</span>',
+        '<ul id="items" hx-swap-oob="true"><li>a</li><li>c</li></ul>',
+    ]
+    assert tagic.diff(old.freeze(), _panel(2).freeze()) == [
+        '<p id="count" hx-swap-oob="true">Count: 2</p>'
+    ]
+    # the new tree is not changed
+    new = _panel(3)
+    tagic.diff(old, new)
+    assert new.render() == _panel(3).render()
+
+
+def test_diff_root():
+    old = _panel(1)
+    new = _panel(1)
+    new.add_class("wide")
+    assert tagic.diff(old, new) == [
+        new.render().replace('id="panel"', 'id="panel" hx-swap-oob="true"')
+    ]
+    # a change of the direct text of the root
+    assert tagic.diff(div(id="x")["a"], div(id="x")["b"]) == [
+        '<div id="x" hx-swap-oob="true">b</div>'
+    ]
+
+    with pytest.raises(ValueError):
+        tagic.diff(div["a"], div["b"])
+    with pytest.raises(ValueError):
+        tagic.diff(div(id="a"), div(id="b"))
@@ -398,3 +398,17 @@ def test_filter_none_elements():
             ul(children=[li[f"elem {i}"] if i % 2 == 0 else None for i in range(5)]),
         ]
     )
+
+
+def test_attr_values_are_escaped():
+    assert (
+        '<a title="&quot;quoted&quot; &lt;b&gt;" href="/?a=1&amp;b=2">x</a>'
+        == a(href="/?a=1&b=2", title='"quoted" <b>')["x"].render()
+    )
+    assert '<div data-vals="{&quot;a&quot;: 1}"></div>' == str(
+        div(data_attr={"vals": '{"a": 1}'})
+    )
+    # use NoEscape for already escaped values
+    assert '<a href="/?a=1&amp;b=2"></a>' == str(
+        a(attr={"href": base.NoEscape("/?a=1&amp;b=2")})
+    )
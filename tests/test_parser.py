@@ -0,0 +1,101 @@
+import io
+
+import tagic
+from tagic.base import NoEscape, RenderOptions
+from tagic.html import (
+    body,
+    br,
+    dd,
+    del_,
+    div,
+    dl,
+    dt,
+    html,
+    input,
+    li,
+    optgroup,
+    option,
+    p,
+    select,
+    table,
+    tbody,
+    td,
+    th,
+    thead,
+    tr,
+    ul,
+)
+from tagic.xml import XML
+
+_PAGE = (
+    "<!DOCTYPE html>\n<html><head><title>T &amp; x</title></head>"
+    '<body class="a b" data-x="1" aria-label="l" x-on="f()">'
+    "<ul><li>one<li>two &lt;</ul><p>x<div hidden>y</div>"
+    '<input type=checkbox checked disabled=""><br/>'
+    '<my-el foo="bar">z</my-el><!-- c --><script>if (a < b) {}</script>'
+    "<del>d</del></body></html>"
+)
+
+
+def test_parse():
+    (page,) = tagic.parse(_PAGE)
+    assert isinstance(page, html)
+    assert page.render() == (
+        "<!DOCTYPE html>\n<html><head><title>T &amp; x</title></head>"
+        '<body class="a b" x-on="f()" data-x="1" aria-label="l">'
+        "<ul><li>one</li><li>two &lt;</li></ul><p>x</p><div hidden>y</div>"
+        '<input checked disabled type="checkbox" /><br />'
+        '<my-el foo="bar">z</my-el><!-- c --><script>if (a < b) {}</script>'
+        "<del>d</del></body></html>"
+    )
+
+    page_body = page.children[1]
+    assert isinstance(page_body, body)
+    assert page_body.class_ == "a b"
+    assert page_body.data_attr == {"x": "1"}
+    assert page_body.aria_attr == {"label": "l"}
+    assert page_body.attr == {"x-on": "f()"}
+    checkbox = page_body.children[3]
+    assert isinstance(checkbox, input)
+    assert checkbox.checked is True
+    assert checkbox.disabled is True
+    assert isinstance(page_body.children[5], XML)
+    assert page_body.children[6] == NoEscape("<!-- c -->")
+    assert isinstance(page_body.children[8], del_)
+
+
+def test_parse_stream():
+    (page,) = tagic.parse(_PAGE)
+    (chunked,) = tagic.parse(io.StringIO(_PAGE), chunk_size=7)
+    assert chunked == page
+    assert chunked.fingerprint() == page.fingerprint()
+
+
+def test_parse_fragments():
+    assert tagic.parse("a <b>c</b> d")[0] == "a "
+    assert tagic.parse("<p>x</p>\n<p>y</p>") == [p["x"], p["y"]]
+    nodes = tagic.parse("<div><p>a<p>b<ul><li>c</div></span>")
+    assert nodes == [div[p["a"], p["b"], ul[li["c"]]]]
+    assert tagic.parse("<br>text") == [br(), "text"]
+
+
+def test_parse_empty_custom_elements():
+    for source in ["<my-icon></my-icon>x", "<my-icon/>x", "<my-icon>"]:
+        nodes = tagic.parse(source)
+        assert nodes[0] == XML("my-icon", children=[""])
+        assert nodes[0].render() == "<my-icon></my-icon>"
+
+
+def test_parse_minified():
+    trees = [
+        div[ul[li["a"], li[p["b"], p["c"]]], p["d"]],
+        table[tr[td["1"]], tr[td["2"]]],
+        table[thead[tr[th["a"]]], tbody[tr[td["1"]], tr[td[table[tr[td["x"]]]]]]],
+        ul[li[p["a"]], li["b"]],
+        dl[dt["t"], dd[p["x"]], dt["u"], dd["y"]],
+        select[optgroup[option["a"], option["b"]], optgroup[option["c"]]],
+        html[body[ul[li[ul[li["x"]]], li["y"]]]],
+    ]
+    for tree in trees:
+        minified = tree.render(options=RenderOptions(minify=True))
+        assert tagic.parse(minified) == [tree], minified
@@ -0,0 +1,115 @@
+import pickle
+
+import pytest
+
+from tagic.html import a, button, div, li, nav, p, ul
+from tagic.xml import XML
+
+# nodes below the root of `_page`, without the frozen one
+_NODES = 10
+
+
+def _page():
+    return div(id="page")[
+        nav[
+            ul[
+                li(class_="item active")[a(href="/")["Home"]],
+                li(class_="item")[
+                    a(href="/about", data_attr={"nav": "about"})["About"]
+                ],
+            ]
+        ],
+        div(class_="content")[
+            p(id="intro")["Hello"],
+            button(class_="btn primary", disabled=True)["Ok"],
+            XML("x-card", attrs={"id": "card", "class": "item"}),
+            div(class_="frozen").freeze(),
+        ],
+    ]
+
+
+def test_find_by_id():
+    page = _page()
+    assert page.find_by_id("intro") is page.children[1].children[0]
+    assert page.find_by_id("card").tag_name == "x-card"
+    assert page.find_by_id("missing") is None
+    # only the nodes below
+    assert page.find_by_id("page") is None
+
+
+def test_find_all():
+    page = _page()
+    assert [node.render() for node in page.find_all("a")] == [
+        '<a href="/">Home</a>',
+        '<a href="/about" data-nav="about">About</a>',
+    ]
+    assert [node.tag_name for node in page.find_all(class_="item")] == [
+        "li",
+        "li",
+        "x-card",
+    ]
+    assert len(page.find_all("li", class_="active")) == 1
+    assert page.find_all("span") == []
+    # frozen nodes are not searched
+    assert page.find_all(class_="frozen") == []
+    assert len(page.find_all()) == _NODES
+
+
+def test_select():
+    page = _page()
+
+    def select(selector):
+        return [node.render() for node in page.select(selector)]
+
+    assert select("li.active > a") == ['<a href="/">Home</a>']
+    assert select("nav a[data-nav=about]") == [
+        '<a href="/about" data-nav="about">About</a>'
+    ]
+    assert select("div > p#intro, button[disabled]") == [
+        '<p id="intro">Hello</p>',
+        '<button class="btn primary" disabled>Ok</button>',
+    ]
+    assert select(".btn.primary") == select("[class='btn primary']")
+    assert select("#page > nav") == [page.children[0].render()]
+    assert select("div > a") == []
+    assert page.select("*") == page.find_all()
+
+    for invalid in ["", "div >", "a:hover", "li ~ li"]:
+        with pytest.raises(ValueError, match="Invalid selector"):
+            page.select(invalid)
+
+
+def test_query_index_reused():
+    page = _page()
+    page.find_by_id("intro")
+    index = page._index
+    assert page.select("li") and page.find_all("a")
+    assert page._index is index
+
+
+def test_query_index_invalidated():
+    page = _page()
+    intro = page.find_by_id("intro")
+    assert page.find_all(class_="new") == []
+
+    intro.add_class("new")
+    assert page.find_all(class_="new") == [intro]
+    intro.remove_class("new")
+    assert page.find_all(class_="new") == []
+
+    # a change deep in the tree
+    intro[p(id="nested")]
+    assert page.find_by_id("nested") is intro.children[0]
+    # the index of a subtree is invalidated as well
+    content = page.children[1]
+    assert content.find_by_id("nested") is not None
+    intro["text"]
+    assert content.find_by_id("nested") is None
+    assert page.find_by_id("nested") is None
+
+
+def test_query_index_not_copied():
+    page = _page()
+    page.find_by_id("intro")
+    assert "_index" not in pickle.loads(pickle.dumps(page)).__dict__
+    assert page.freeze()._node.__dict__.keys() == {"id", "children"}
@@ -0,0 +1,596 @@
+import asyncio
+import copy
+import html
+import io
+import pickle
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import pytest
+
+from tagic import base
+from tagic.base import RenderOptions
+from tagic.html import (
+    DataTable,
+    HTMLElement,
+    a,
+    body,
+    br,
+    div,
+    form,
+    head,
+    li,
+    p,
+    pre,
+    script,
+    span,
+    table,
+    td,
+    title,
+    tr,
+    ul,
+)
+from tagic.html import html as html_tag
+from tagic.html import input as input_
+from tagic.xml import XML
+
+
+def _page():
+    return html_tag[
+        head[title["Title"]],
+        body[
+            div(id="main")[
+                p["some & text", br(), span["more"]],
+                script[";"],
+            ]
+        ],
+    ]
+
+
+def test_render_to_sink():
+    for indent in (False, True):
+        sink = io.StringIO()
+        _page().render_to(sink, indent=indent)
+        assert sink.getvalue() == _page().render(indent=indent)
+
+
+def test_render_to_xml():
+    sink = io.StringIO()
+    XML("root", is_root=True)[XML("child")["a"]].render_to(sink)
+    assert (
+        sink.getvalue() == "<?xml version='1.0' encoding='UTF-8' ?>\n"
+        "<root><child>a</child></root>"
+    )
+
+
+def test_iter_render():
+    for indent in (False, True):
+        expect = _page().render(indent=indent)
+        assert "".join(_page().iter_render(indent=indent)) == expect
+
+        chunk_size = 16
+        chunks = list(_page().iter_render(indent=indent, chunk_size=chunk_size))
+        assert len(chunks) > 1
+        assert all(len(chunk) >= chunk_size for chunk in chunks[:-1])
+        assert "".join(chunks) == expect
+        assert chunks[0].startswith("<!DOCTYPE html>\n")
+
+
+def test_iter_render_xml():
+    root = XML("root", is_root=True)[XML("child")["a"], "b"]
+    assert "".join(root.iter_render(chunk_size=1)) == root.render()
+    assert "".join(root.iter_render(indent=True)) == root.render(indent=True)
+
+
+def test_iter_render_void_and_raw():
+    with pytest.raises(ValueError):
+        list(br["text"].iter_render())
+    assert list(script["a < b"].iter_render(chunk_size=1)) == [
+        "<script>",
+        "a < b",
+        "</script>",
+    ]
+    # empty raw tags are not indented inside
+    assert div[script()].render(indent=True) == (
+        "<div>\n  <script>\n  </script>\n</div>\n"
+    )
+    assert div[script()].render() == "<div><script></script></div>"
+
+
+def test_attr_plan_is_computed_once():
+    plan = div._attr_plan()
+    assert plan is div._attr_plan()
+    assert plan is div()._attr_plan()
+    names = [name for _, name, _ in plan]
+    assert "class" in names
+    assert "hx-swap-oob" in names
+    assert names[-3:] == ["", "data-", "aria-"]
+    assert "children" not in names
+
+
+def test_attr_plan_per_class():
+    assert ("accept_charset", "accept-charset", 0) in form._attr_plan()
+    assert ("accept_charset", "accept-charset", 0) not in div._attr_plan()
+    assert XML._attr_plan() == (("attr", "", 1),)
+
+
+def test_render_does_not_change_the_tree():
+    children = [None, "a", None]
+    raw = ["x < y", None]
+    tree = div(children=[p(children=children), script(children=raw), span(), br()])
+    tree_children = list(tree.children)
+
+    expect = "<div><p>a</p><script>x < y</script><span></span><br /></div>"
+    assert tree.render() == expect
+    assert tree.render() == expect
+    assert "".join(tree.iter_render()) == expect
+    assert tree.children == tree_children
+    assert children == [None, "a", None]
+    assert raw == ["x < y", None]
+    assert tree.children[2].children == []
+
+
+def test_render_concurrently():
+    tree = _page()
+    expect = tree.render(indent=True)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: tree.render(indent=True), range(32)))
+    assert results == [expect] * 32
+
+
+def test_freeze():
+    nav = ul(class_="nav")[li[a(href="/")["Home"]], li[a(href="/about")["About"]]]
+    frozen = nav.freeze()
+    assert frozen.freeze() is frozen
+    assert frozen.tag_name == "ul"
+
+    for indent in (False, True):
+        expect = body[div[nav]].render(indent=indent)
+        for _ in range(2):
+            assert body[div[frozen]].render(indent=indent) == expect
+            assert "".join(body[div[frozen]].iter_render(indent=indent)) == expect
+        assert frozen.render(indent=indent) == nav.render(indent=indent)
+
+    # later changes of the original do not change the frozen copy
+    nav.add_class("changed")
+    assert "changed" not in body[frozen].render()
+    assert "changed" not in body[frozen].render(indent=True)
+
+    with pytest.raises(TypeError):
+        frozen["x"]
+
+    # equal by the frozen node, not by what was rendered
+    assert frozen != nav.freeze()
+    assert div["x"].freeze() == div["x"].freeze().freeze()
+    rendered = div["x"].freeze()
+    rendered.render()
+    assert rendered == div["x"].freeze()
+    assert div[rendered] == div[div["x"].freeze()]
+
+
+def test_freeze_follows_config():
+    frozen = div(hidden=True).freeze()
+    assert frozen.render() == "<div hidden></div>"
+    base.DOMConfig.FULL_XHTML = True
+    try:
+        assert frozen.render() == '<div hidden="hidden"></div>'
+    finally:
+        base.DOMConfig.FULL_XHTML = False
+
+
+def test_deep_tree():
+    depth = 5 * sys.getrecursionlimit()
+    tree = XML("leaf")["x"]
+    for _ in range(depth):
+        tree = XML("n")[tree]
+    root = XML("root", is_root=True)[tree]
+
+    compact = root.render()
+    assert compact == (
+        "<?xml version='1.0' encoding='UTF-8' ?>\n<root>"
+        + "<n>" * depth
+        + "<leaf>x</leaf>"
+        + "</n>" * depth
+        + "</root>"
+    )
+    assert "".join(root.iter_render()) == compact
+    indented = root.render(indent=True)
+    assert indented.count("\n") == 2 * depth + 6
+    assert "".join(root.iter_render(indent=True)) == indented
+
+
+def test_deep_html():
+    tree = span["x"]
+    for _ in range(3000):
+        tree = div[tree]
+    page = html_tag[body[tree]]
+    assert page.render().startswith("<!DOCTYPE html>\n<html><body><div><div>")
+    assert asyncio.run(page.arender()) == page.render()
+
+
+def test_render_options():
+    page = html_tag[body[div(hidden=True)[p["x"]]]]
+    xhtml = RenderOptions(full_xhtml=True)
+    assert page.render(options=xhtml) == (
+        '<?xml version="1.0" encoding="UTF-8" ?>\n'
+        '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.1//EN" '
+        '"http://www.w3.org/TR/xhtml11/DTD/xhtml11.dtd">\n'
+        '<html><body><div hidden="hidden"><p>x</p></div></body></html>'
+    )
+    assert page.render(options=RenderOptions(indent=4)) == (
+        "<!DOCTYPE html>\n<html>\n    <body>\n        <div hidden>\n"
+        "            <p>\n                x\n            </p>\n"
+        "        </div>\n    </body>\n</html>\n"
+    )
+    # same as the global config
+    assert page.render(options=RenderOptions(indent=2)) == page.render(indent=True)
+    assert page.render(options=RenderOptions()) == page.render()
+    assert "".join(page.iter_render(options=xhtml)) == page.render(options=xhtml)
+    assert asyncio.run(page.arender(options=xhtml)) == page.render(options=xhtml)
+
+
+def test_render_options_deep_indent():
+    tree = span["x"]
+    for _ in range(100):
+        tree = div[tree]
+    options = RenderOptions(indent=3)
+    lines = tree.render(options=options).splitlines()
+    assert lines[100] == " " * 300 + "<span>"
+    assert lines[101] == " " * 303 + "x"
+
+
+def test_render_options_concurrently():
+    page = html_tag[body[div(hidden=True)["x"]]]
+    options = [RenderOptions(), RenderOptions(full_xhtml=True, indent=1)]
+    expect = [page.render(options=o) for o in options]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(
+            pool.map(lambda i: page.render(options=options[i % 2]), range(64))
+        )
+    assert results == expect * 32
+
+
+def test_escape():
+    for text in ["plain", "a & b", "<p class='x'>\"y\"</p>", "x" * 100 + "&", ""]:
+        assert base.escape_text(text) == html.escape(text)
+        assert base.escape_attr(text) == html.escape(text).replace("&#x27;", "'")
+    text = "no special characters"
+    assert base.escape_text(text) is text
+    assert base.escape_attr(text) is text
+
+
+def test_render_bytes():
+    page = html_tag[body[p["Grüße & €"]]]
+    assert page.render_bytes() == page.render().encode("utf-8")
+    assert page.render_bytes(indent=True) == page.render(indent=True).encode()
+    assert page.render_bytes(encoding="latin-1") == (
+        "<!DOCTYPE html>\n<html><body><p>Grüße &amp; &#8364;</p></body></html>"
+    ).encode("latin-1")
+    assert page.render_bytes(encoding="utf-16") == page.render().encode("utf-16")
+
+
+def test_render_bytes_prolog():
+    root = XML("root", is_root=True)["ä"]
+    assert root.render_bytes() == (
+        "<?xml version='1.0' encoding='UTF-8' ?>\n<root>ä</root>".encode()
+    )
+    assert root.render_bytes(encoding="ascii") == (
+        b"<?xml version='1.0' encoding='ASCII' ?>\n<root>&#228;</root>"
+    )
+    xhtml = RenderOptions(full_xhtml=True)
+    assert (
+        html_tag()
+        .render_bytes(encoding="latin-1", options=xhtml)
+        .startswith(b'<?xml version="1.0" encoding="LATIN-1" ?>\n')
+    )
+
+
+def test_render_to_binary_sinks():
+    page = _page()
+    expect = page.render(indent=True).encode()
+
+    sink = io.BytesIO()
+    page.render_to(sink, indent=True, encoding="utf-8")
+    assert sink.getvalue() == expect
+
+    buffer = bytearray()
+    page.render_to(buffer, indent=True, encoding="utf-8")
+    assert buffer == expect
+
+
+def test_render_to_file(tmp_path):
+    page = _page()
+    path = tmp_path / "index.html"
+    page.render_to_file(path, indent=True, buffer_size=16)
+    assert path.read_bytes() == page.render(indent=True).encode()
+
+    page.render_to_file(str(path), atomic=False)
+    assert path.read_text() == page.render()
+
+    latin = RenderOptions(encoding="latin-1")
+    XML("r", is_root=True)["€ä"].render_to_file(path, options=latin)
+    assert path.read_bytes() == (
+        b"<?xml version='1.0' encoding='LATIN-1' ?>\n<r>&#8364;\xe4</r>"
+    )
+    assert [p.name for p in tmp_path.iterdir()] == ["index.html"]
+
+
+def test_render_to_file_keeps_old_file_on_error(tmp_path):
+    path = tmp_path / "index.html"
+    path.write_text("old")
+    with pytest.raises(ValueError):
+        div[p["new"], br["not allowed"]].render_to_file(path, buffer_size=64)
+    assert path.read_text() == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["index.html"]
+
+
+def test_render_workers():
+    page = html_tag[body[div(id="list")[[li[str(i), " & more"] for i in range(50)]]]]
+    for indent in (False, True):
+        expect = page.render(indent=indent)
+        assert page.render(indent=indent, workers=2) == expect
+        with ThreadPoolExecutor(3) as executor:
+            assert page.render(indent=indent, workers=executor) == expect
+    # nothing to split
+    assert div[p["x"]].render(workers=2) == "<div><p>x</p></div>"
+    assert page.render(workers=2) == page.render()
+
+
+def test_pickle_only_set_fields():
+    node = div(id="x", data_attr={"a": "b"})[p["y"]]
+    _, (entries,) = node.__reduce__()
+    cls, state, children, refs = entries[0]
+    assert cls is div
+    assert set(state) == {"id", "data_attr"}
+    assert children == [None] and refs == [(0, 1)]
+    assert entries[1] == (p, {}, ["y"], [])
+    copy = pickle.loads(pickle.dumps(node))
+    assert copy == node
+    assert copy.render() == node.render()
+    assert copy.attr is not pickle.loads(pickle.dumps(node)).attr
+
+
+def test_copy_deep_tree():
+    def deep(leaf):
+        node = XML("leaf")[leaf]
+        for _ in range(sys.getrecursionlimit() * 2):
+            node = XML("level")[node]
+        return node
+
+    page = div[deep("a"), deep(p["b"])]
+    expect = page.render()
+    assert page.freeze().render() == expect
+    assert pickle.loads(pickle.dumps(page)).render() == expect
+    assert page.render(workers=2) == expect
+
+    # shallow copies share the children
+    copied = copy.copy(page)
+    assert copied.children is page.children
+    shared = p["x"]
+    restored = pickle.loads(pickle.dumps(div[shared, shared]))
+    assert restored.children[0] is restored.children[1]
+
+
+def test_fingerprint():
+    page = _page()
+    fingerprint = page.fingerprint()
+    assert len(fingerprint) == 32  # noqa: PLR2004
+    assert _page().fingerprint() == fingerprint
+    assert page.freeze().fingerprint() == fingerprint
+    assert page.fingerprint() == fingerprint
+
+    assert div["a", "b"].fingerprint() != div["ab"].fingerprint()
+    assert div["a"].fingerprint() != span["a"].fingerprint()
+    assert div(id="a").fingerprint() != div(data_attr={"id": "a"}).fingerprint()
+    assert XML("r", is_root=True).fingerprint() != XML("r").fingerprint()
+
+    node = div(class_="x")["a"]
+    before = node.fingerprint()
+    node.add_class("y")
+    assert node.fingerprint() != before
+    node.remove_class("y")
+    assert node.fingerprint() == before
+    node["b"]
+    assert node.fingerprint() == div(class_="x")["b"].fingerprint()
+
+
+def test_fingerprint_of_ancestors():
+    leaf = span["a"]
+    inner = p[leaf]
+    page = div[inner, "x"]
+    before = page.fingerprint()
+    assert p[span["a"]].fingerprint() == inner.fingerprint()
+
+    # reset by changing a descendant, also one fingerprinted before
+    leaf["b"]
+    assert page.fingerprint() == div[p[span["b"]], "x"].fingerprint()
+    assert inner.fingerprint() == p[span["b"]].fingerprint()
+    leaf.add_class("c")
+    assert page.fingerprint() == div[p[span(class_="c")["b"]], "x"].fingerprint()
+    # a new parent reuses the fingerprint of `inner`
+    outer = div[inner]
+    outer.fingerprint()
+    leaf.remove_class("c")
+    leaf["a"]
+    assert page.fingerprint() == before
+    assert outer.fingerprint() == div[p[span["a"]]].fingerprint()
+
+
+def test_fingerprint_deep_tree():
+    node = span["leaf"]
+    for _ in range(sys.getrecursionlimit() * 2):
+        node = div[node]
+    assert len(node.fingerprint()) == 32  # noqa: PLR2004
+
+
+def test_sparse_nodes():
+    node = div(id="x")["text"]
+    assert node.__dict__ == {"id": "x", "children": ["text"]}
+    assert node.render() == '<div id="x">text</div>'
+    assert node.__dict__.keys() == {"id", "children"}
+    assert br().render() == "<br />"
+
+    # default factories are per node
+    node.data_attr["a"] = "b"
+    assert div().data_attr == {}
+    assert node.render() == '<div id="x" data-a="b">text</div>'
+    assert node == div(id="x", data_attr={"a": "b"})["text"]
+
+    with pytest.raises(TypeError, match="idd"):
+        div(idd="x")
+
+
+def test_attributes_in_declared_order():
+    assert div(title="t", id="x", class_="c", data_attr={"a": "1"}).render() == (
+        '<div class="c" id="x" title="t" data-a="1"></div>'
+    )
+
+    class button(HTMLElement):
+        type: str = "button"
+
+    assert button().render() == '<button type="button"></button>'
+    assert button(type="submit", id="b").render() == (
+        '<button id="b" type="submit"></button>'
+    )
+
+
+def test_node_fields():
+    fields = div._FIELDS
+    assert list(fields)[:2] == ["attr", "children"]
+    assert "class_" in fields
+    assert "NAME" not in fields
+    assert "href" in a._FIELDS
+    assert "href" not in fields
+    assert not fields["_fingerprint"].init
+
+    namespace = {}
+    exec("from tagic.html import *", namespace)
+    assert namespace["div"] is div
+
+
+def test_own_elements():
+    class my_el(div):
+        foo: str | None = None
+
+    assert (
+        my_el(foo="1", class_="c")["x"].render() == '<my_el class="c" foo="1">x</my_el>'
+    )
+
+    with pytest.raises(TypeError, match="not dataclasses"):
+
+        @dataclass(kw_only=True, slots=True, repr=False)
+        class slotted(div):
+            foo: str | None = None
+
+    with pytest.raises(TypeError, match="cannot have __slots__"):
+
+        class with_slots(div):
+            __slots__ = ("foo",)
+
+    class required(div):
+        foo: str
+
+    assert required(foo="1").foo == "1"
+    with pytest.raises(TypeError, match="missing required keyword arguments: foo"):
+        required()
+    with pytest.raises(TypeError, match="missing required"):
+        required(id="x")
+
+
+def test_own_do_render():
+    class shout(span):
+        def do_render(self, indent):
+            return super().do_render(indent).upper()
+
+    class stars(HTMLElement):
+        def do_render(self, indent):
+            return "***" if indent is None else f"{indent}***\n"
+
+    page = div[p[shout["hi"], stars()], stars()]
+    assert page.render() == "<div><p><SHOUT>HI</SHOUT>***</p>***</div>"
+    assert page.render(indent=True) == (
+        "<div>\n  <p>\n    <SHOUT>\n      HI\n    </SHOUT>\n    ***\n  </p>\n"
+        "  ***\n</div>\n"
+    )
+    assert "".join(page.iter_render()) == page.render()
+    assert page.freeze().render() == page.render()
+    assert shout["x"].render() == "<SHOUT>X</SHOUT>"
+    assert div[stars()].render(options=RenderOptions(minify=True)) == "<div>***</div>"
+    assert asyncio.run(page.arender()) == page.render()
+
+
+def test_own_do_render_options():
+    class card(HTMLElement):
+        def do_render(self, indent):
+            return super().do_render(indent)
+
+    def page(cls):
+        return div[cls[p["x  y"], input_(disabled=True)], p["z"]]
+
+    for options in [
+        RenderOptions(indent=4),
+        RenderOptions(full_xhtml=True),
+        RenderOptions(indent=3, full_xhtml=True),
+        RenderOptions(minify=True),
+    ]:
+        expect = page(form).render(options=options).replace("form", "card")
+        assert page(card).render(options=options) == expect
+        assert "".join(page(card).iter_render(options=options)) == expect
+    # from other threads at once
+    options = RenderOptions(indent=4)
+    with ThreadPoolExecutor(4) as executor:
+        assert set(
+            executor.map(lambda _: page(card).render(options=options), range(8))
+        ) == {page(form).render(options=options).replace("form", "card")}
+
+
+def test_minify():
+    minify = RenderOptions(minify=True)
+    page = html_tag[
+        head[title["A  title"]],
+        body[
+            p["some\n   text"],
+            p(class_="a b", id="x")["more", br()],
+            ul[li["1"], li[a(href="/a")["2"]]],
+            div["  keep\n pre:", pre["  as\n  is"]],
+            table[tr[td["1"], td["2"]], tr[td["3"]]],
+            a[p["inside a"]],
+            form[input_(type="text", value="", disabled=True)],
+        ],
+    ]
+    assert page.render(options=minify) == (
+        "<!DOCTYPE html>\n<html><head><title>A title</title><body>"
+        '<p>some text<p class="a b" id=x>more<br>'
+        "<ul><li>1<li><a href=/a>2</a></ul>"
+        "<div> keep pre:<pre>  as\n  is</pre></div>"
+        "<table><tr><td>1<td>2<tr><td>3</table>"
+        "<a><p>inside a</p></a>"
+        '<form><input disabled type=text value=""></form>'
+    )
+    # p before text and a fragment keep their end tags
+    assert div[p["x"], "y"].render(options=minify) == "<div><p>x</p>y</div>"
+    assert li["x"].render(options=minify) == "<li>x</li>"
+    # xml is not changed
+    assert XML("r")[XML("a", attrs={"b": "c"})["  x  "]].render(options=minify) == (
+        '<r><a b="c">  x  </a></r>'
+    )
+
+    with pytest.raises(ValueError):
+        RenderOptions(minify=True, indent=2)
+
+
+def test_minify_frozen_and_tables():
+    minify = RenderOptions(minify=True)
+    # frozen nodes and tables keep the whitespace in pre
+    assert pre["a  b", span["x  y"].freeze()].render(options=minify) == (
+        "<pre>a  b<span>x  y</span></pre>"
+    )
+    assert pre[DataTable([["a  b"]], ["h"])].render(options=minify) == (
+        "<pre><table><thead><tr><th>h<tbody><tr><td>a  b</table></pre>"
+    )
+    # and omit end tags by their siblings
+    assert ul[li["a"].freeze(), li["b"].freeze()].render(options=minify) == (
+        "<ul><li>a<li>b</ul>"
+    )
+    assert div[p["x"].freeze(), "y"].render(options=minify) == "<div><p>x</p>y</div>"
@@ -0,0 +1,131 @@
+import csv
+import io
+from copy import copy
+
+import pytest
+
+from tagic.base import NoEscape, RenderOptions
+from tagic.html import (
+    Column,
+    DataTable,
+    a,
+    caption,
+    div,
+    p,
+    table,
+    tbody,
+    td,
+    th,
+    thead,
+    tr,
+)
+
+_OPTIONS = [
+    RenderOptions(),
+    RenderOptions(indent=2),
+    RenderOptions(minify=True),
+    RenderOptions(full_xhtml=True),
+]
+
+
+def _assert_renders_like(data_table, tree):
+    for options in _OPTIONS:
+        # as root and nested
+        assert data_table.render(options=options) == tree.render(options=options)
+        assert div[data_table].render(options=options) == div[tree].render(
+            options=options
+        )
+
+
+def test_data_table():
+    rows = [
+        ["1", "a  b & c"],
+        [2, None],
+        [NoEscape("<i>raw</i>"), a(href="/x")["link"]],
+        ["last", p["text"]],
+    ]
+    cell = td(class_="value", data_attr={"x": "1"})
+    row = tr(class_="row")
+    data_table = DataTable(
+        rows, ["Name", Column(th(scope="col")["Value"], cell)], row=row, id="t"
+    )[caption["Caption"]]
+
+    tree = table(id="t")[
+        caption["Caption"],
+        thead[tr[th["Name"], th(scope="col")["Value"]]],
+        tbody[
+            copy(row)[td["1"], copy(cell)["a  b & c"]],
+            # numbers are converted by str
+            copy(row)[td["2"], copy(cell)],
+            copy(row)[td[NoEscape("<i>raw</i>")], copy(cell)[a(href="/x")["link"]]],
+            copy(row)[td["last"], copy(cell)[p["text"]]],
+        ],
+    ]
+    _assert_renders_like(data_table, tree)
+
+
+def test_data_table_sources():
+    reader = csv.reader(io.StringIO("1,2\n3,4\n"))
+    tree = table[tbody[tr[td["1"], td["2"]], tr[td["3"], td["4"]]]]
+    # without headers, there is no head
+    assert DataTable(reader, [Column(), Column()]).render() == tree.render()
+    # rows are read while rendering
+    rows = ([str(i), str(i + 1)] for i in (1, 3))
+    assert DataTable(rows, [Column(), Column()]).render() == tree.render()
+
+    from_columns = DataTable.from_columns(
+        {"A": [1, 3], "B": [2, 4]}, [Column(), Column(format=lambda v: f"{v:.1f}")]
+    )
+    assert from_columns.render() == (
+        "<table><tbody><tr><td>1</td><td>2.0</td></tr>"
+        "<tr><td>3</td><td>4.0</td></tr></tbody></table>"
+    )
+    assert DataTable.from_columns({"A": [1]}).render() == (
+        "<table><thead><tr><th>A</th></tr></thead>"
+        "<tbody><tr><td>1</td></tr></tbody></table>"
+    )
+
+
+def test_data_table_empty():
+    _assert_renders_like(DataTable([], ["A"]), table[thead[tr[th["A"]]], tbody()])
+
+
+def test_data_table_errors():
+    with pytest.raises(ValueError, match="at least one column"):
+        DataTable([], [])
+    with pytest.raises(ValueError, match="cannot have children"):
+        DataTable([], [Column("A", td["x"])])
+    with pytest.raises(ValueError, match="2 values for 1 columns"):
+        DataTable([["a", "b"]], ["A"]).render()
+
+
+def _rows():
+    return ([str(i), str(i * 2)] for i in range(3))
+
+
+def test_data_table_iterator_rows():
+    expect = DataTable(list(_rows()), ["A", "B"]).render()
+
+    data_table = DataTable(_rows(), ["A", "B"])
+    assert data_table.render() == expect
+    with pytest.raises(ValueError, match="already rendered"):
+        data_table.render()
+
+    # read into a tuple on copies, the table renders again
+    data_table = DataTable(_rows(), ["A", "B"])
+    frozen = data_table.freeze()
+    assert frozen.render() == data_table.render() == expect
+    assert data_table.render() == expect
+
+    # the tables are sent to the worker processes
+    page = div[[DataTable(_rows(), ["A", "B"]) for _ in range(4)]]
+    assert page.render(workers=2) == f"<div>{expect * 4}</div>"
+
+
+def test_data_table_fingerprint():
+    first = DataTable(_rows(), ["A", "B"])
+    second = DataTable(_rows(), ["A", "B"])
+    assert first.fingerprint() == second.fingerprint()
+    assert first == second
+    assert first.fingerprint() != DataTable([["x", "y"]], ["A", "B"]).fingerprint()
+    assert first.render() == second.render()
@@ -0,0 +1,102 @@
+import pytest
+
+from tagic.base import NoEscape
+from tagic.html import a, body, div, li, p, script, span, style, title, ul
+from tagic.html import html as html_tag
+from tagic.template import Slot, Template
+
+
+def _page(user, items, href):
+    return html_tag[
+        title["Page"],
+        body[
+            div(id="user", class_="box")[span["Hello "], user],
+            ul[items],
+            a(href=href)["link"],
+        ],
+    ]
+
+
+def test_template():
+    template = Template(_page(Slot("user"), Slot("items"), Slot("href")))
+    assert template.names == {"user", "items", "href"}
+
+    items = [li["one"], li["two & three"]]
+    assert (
+        template.render(user="<Bob>", items=items, href="/foo")
+        == _page("<Bob>", items, "/foo").render()
+    )
+    assert (
+        template.render(user=None, items=[], href="/") == _page(None, [], "/").render()
+    )
+
+
+def test_template_indent():
+    template = Template(_page(Slot("user"), Slot("items"), Slot("href")), indent=True)
+
+    items = [li["one"], None, "text", li[span["two"]]]
+    assert template.render(user=p["Bob"], items=items, href="/foo") == _page(
+        p["Bob"], items, "/foo"
+    ).render(indent=True)
+    assert template.render(user="Bob", items="x", href="/") == _page(
+        "Bob", "x", "/"
+    ).render(indent=True)
+
+
+def test_template_raw_slots():
+    def page(type_, code, css, text):
+        return div[script(type=type_)[code], style[css], p[text]]
+
+    code, css = "if (a < b) {\n  x();\n}", NoEscape("p > a {}")
+    for indent in (False, True):
+        template = Template(
+            page(Slot("type"), Slot("code"), Slot("css"), Slot("text")), indent
+        )
+        assert template.render(type="module", code=code, css=css, text="a < b") == page(
+            "module", code, css, "a < b"
+        ).render(indent=indent)
+
+    template = Template(div[script[Slot("code")]])
+    assert template.render(code=["a<", None, "b"]) == "<div><script>a<b</script></div>"
+    with pytest.raises(ValueError):
+        template.render(code=p["x"])
+
+
+def test_template_inline_slots():
+    def page(kind, name, src, first, second):
+        return div(class_=f"btn {kind}", id="x")[
+            p[f"Hello {name}!"],
+            script(src=f"/js/{src}.js"),
+            p[f"{first}{second}"],
+            f"- {first}",
+        ]
+
+    values = {"kind": "k<", "name": "<Bob>", "src": "a&b", "first": "1", "second": "2"}
+    for indent in (False, True):
+        template = Template(page(**{name: Slot(name) for name in values}), indent)
+        assert template.render(**values) == page(**values).render(indent=indent)
+
+    # within other text, nodes are rendered inline
+    template = Template(p[f"a {Slot('x')}"], indent=True)
+    assert template.render(x=span["b"]) == "<p>\n  a <span>b</span>\n</p>\n"
+
+    with pytest.raises(ValueError):
+        Template(div(data_attr={Slot("x"): "y"}))
+
+
+def test_template_same_slot_twice():
+    template = Template(div(title=Slot("x"))[Slot("x"), Slot("x")])
+    assert template.render(x="a") == '<div title="a">aa</div>'
+
+
+def test_template_missing_and_unknown_values():
+    template = Template(div[Slot("x")])
+    with pytest.raises(TypeError):
+        template.render()
+    with pytest.raises(TypeError):
+        template.render(x="a", y="b")
+
+
+def test_slot():
+    assert repr(Slot("x")) == "Slot('x')"
+    assert Slot("x").name == "x"